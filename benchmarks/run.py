@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""Benchmark the ingest and query path on synthetic data.
+
+Times the roster page parser, the stats table extraction, the CSV loaders,
+the init_* inserts, the read*.py / query.py queries, PlayerTable and the
+leaderboards at the requested player counts. Results are written as JSON and, when a baseline exists,
+compared against it; a benchmark more than --threshold slower than its
+baseline is reported as a regression and the exit status is 1.
+
+Usage:
+  python3 benchmarks/run.py --sizes 1k
+  python3 benchmarks/run.py --sizes 1k,100k --out bench.json
+  python3 benchmarks/run.py --sizes 1k,100k,1m --only parse_html,load_bio_instances
+  python3 benchmarks/run.py --sizes 1k --save-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+import leaderboard
+import query
+from bio_instances import load_bio_instances
+from models import Bio, Stats
+from names import name_key
+from player_table import STATS_SCHEMA, PlayerTable
+from scripts import crawl_roster, populate_stats
+from stats_instances import _to_float, _to_int, load_stats_instances
+
+import synth
+
+try:
+    import pandas as pd
+except Exception:
+    pd = None
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+# differences smaller than this are timer noise, whatever the ratio
+MIN_ABS_DELTA = 0.005
+PAGE_BATCH = 1000
+
+
+class Context:
+    """Per-size scratch space: generated files and a populated database, built once."""
+
+    def __init__(self, n: int, seed: int, workdir: str):
+        self.n = n
+        self.seed = seed
+        self.workdir = workdir
+        self._engine = None
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+    def bio_csv(self) -> str:
+        p = self.path('bio.csv')
+        if not os.path.exists(p):
+            synth.write_bio_csv(p, self.n, self.seed)
+        return p
+
+    def stats_csv(self) -> str:
+        p = self.path('stats.csv')
+        if not os.path.exists(p):
+            synth.write_stats_csv(p, self.n, self.seed)
+        return p
+
+    def fresh_engine(self, name: str):
+        p = self.path(name)
+        if os.path.exists(p):
+            os.remove(p)
+        eng = create_engine(f'sqlite:///{p}')
+        SQLModel.metadata.create_all(eng)
+        return eng
+
+    def engine(self):
+        """A database holding all `n` players, filled with core bulk inserts."""
+        if self._engine is None:
+            eng = self.fresh_engine('populated.db')
+            with eng.begin() as conn:
+                batch = []
+                for row in synth.bio_rows(self.n, self.seed):
+                    batch.append({**row, 'jersey_number': int(row['jersey_number']), 'weight': int(row['weight']),
+                                  'highschool': row['highschool'] or None,
+                                  'name_key': name_key(row['first_name'], row['last_name'])})
+                    if len(batch) >= 10000:
+                        conn.execute(insert(Bio), batch)
+                        batch = []
+                if batch:
+                    conn.execute(insert(Bio), batch)
+                batch = []
+                for row in synth.stats_rows(self.n, self.seed):
+                    r = {k.replace('-', '_'): v for k, v in row.items()}
+                    values = {k: (_to_float(v) if k == 'SH_PCT' else _to_int(v)) for k, v in r.items()}
+                    values.update(first_name=r['first_name'], last_name=r['last_name'], PN_PIM=r['PN_PIM'],
+                                  name_key=name_key(r['first_name'], r['last_name']))
+                    batch.append(values)
+                    if len(batch) >= 10000:
+                        conn.execute(insert(Stats), batch)
+                        batch = []
+                if batch:
+                    conn.execute(insert(Stats), batch)
+            self._engine = eng
+        return self._engine
+
+
+@contextmanager
+def timed(result: dict):
+    gc.collect()
+    start = time.perf_counter()
+    yield
+    result['seconds'] = time.perf_counter() - start
+
+
+# Each benchmark takes a Context and returns (items processed, seconds), or
+# (items, seconds, extra) where `extra` holds additional numbers to report.
+
+def bench_parse_html(ctx: Context):
+    seconds = 0.0
+    pages = synth.player_pages(ctx.n, ctx.seed)
+    while True:
+        batch = [p for _, p in zip(range(PAGE_BATCH), pages)]
+        if not batch:
+            break
+        start = time.perf_counter()
+        for page in batch:
+            crawl_roster.parse_html(page)
+        seconds += time.perf_counter() - start
+    return ctx.n, seconds
+
+
+def bench_extract_stats_table(ctx: Context):
+    html = synth.stats_page(ctx.n, ctx.seed)
+    res = {}
+    with timed(res):
+        table = populate_stats.extract_table_for_phrase(html, 'Individual, Overall, Skaters')
+        rows = populate_stats.extract_body_rows(table)
+    assert len(rows) == ctx.n, f'expected {ctx.n} rows, got {len(rows)}'
+    return ctx.n, res['seconds']
+
+
+def bench_load_bio_instances(ctx: Context):
+    path = ctx.bio_csv()
+    res = {}
+    with timed(res):
+        load_bio_instances(path)
+    return ctx.n, res['seconds']
+
+
+def bench_load_stats_instances(ctx: Context):
+    path = ctx.stats_csv()
+    res = {}
+    with timed(res):
+        load_stats_instances(path)
+    return ctx.n, res['seconds']
+
+
+def _bench_init(ctx: Context, instances: list, db_name: str):
+    # same add-each-then-commit path as init_bio.py / init_stats.py
+    eng = ctx.fresh_engine(db_name)
+    res = {}
+    with timed(res):
+        with Session(eng) as session:
+            for obj in instances:
+                session.add(obj)
+            session.commit()
+    eng.dispose()
+    return len(instances), res['seconds']
+
+
+def bench_init_bio(ctx: Context):
+    return _bench_init(ctx, load_bio_instances(ctx.bio_csv()), 'init_bio.db')
+
+
+def bench_init_stats(ctx: Context):
+    return _bench_init(ctx, load_stats_instances(ctx.stats_csv()), 'init_stats.db')
+
+
+def bench_read_roster(ctx: Context):
+    # the statement and post-processing of read.py
+    eng = ctx.engine()
+    res = {}
+    with timed(res):
+        with Session(eng) as session:
+            records = session.exec(select(Bio)).all()
+        records_list = [r.model_dump() for r in records]
+        if pd is not None:
+            pd.DataFrame(records_list)
+    return len(records_list), res['seconds']
+
+
+def bench_read_position_weight(ctx: Context):
+    # the statement of read2.py
+    eng = ctx.engine()
+    res = {}
+    with timed(res):
+        with Session(eng) as session:
+            records = session.exec(
+                select(Bio.position, func.avg(Bio.weight))
+                .group_by(Bio.position)
+                .having(func.avg(Bio.weight) > 180)
+            ).all()
+        if pd is not None:
+            pd.DataFrame(records)
+    return ctx.n, res['seconds']
+
+
+class _NullSink:
+    def write(self, columns, chunk):
+        pass
+
+    def close(self):
+        pass
+
+
+def _bench_query(ctx: Context, name: str):
+    info = query.run_query(name, _NullSink(), db_engine=ctx.engine())
+    return info['rows'], info['total_seconds']
+
+
+def bench_query_roster(ctx: Context):
+    return _bench_query(ctx, 'roster')
+
+
+def bench_query_roster_stats(ctx: Context):
+    return _bench_query(ctx, 'roster_stats')
+
+
+def _retained_bytes(build):
+    # memory still allocated once `build()` has returned, i.e. the cost of holding its result
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def bench_stats_models_memory(ctx: Context):
+    path = ctx.stats_csv()
+    res = {}
+    with timed(res):
+        load_stats_instances(path)
+    nbytes = _retained_bytes(lambda: load_stats_instances(path))
+    return ctx.n, res['seconds'], {'bytes': nbytes, 'bytes_per_player': round(nbytes / ctx.n, 1)}
+
+
+def bench_player_table_memory(ctx: Context):
+    path = ctx.stats_csv()
+    res = {}
+    with timed(res):
+        PlayerTable.from_stats_csv(path)
+    nbytes = _retained_bytes(lambda: PlayerTable.from_stats_csv(path))
+    return ctx.n, res['seconds'], {'bytes': nbytes, 'bytes_per_player': round(nbytes / ctx.n, 1)}
+
+
+def bench_player_table_from_query(ctx: Context):
+    eng = ctx.engine()
+    res = {}
+    with timed(res):
+        table = PlayerTable.from_query(select(*Stats.__table__.columns), STATS_SCHEMA, db_engine=eng)
+    return len(table), res['seconds']
+
+
+def bench_scan_models_pts(ctx: Context):
+    instances = load_stats_instances(ctx.stats_csv())
+    res = {}
+    with timed(res):
+        sum(s.PTS or 0 for s in instances)
+    return len(instances), res['seconds']
+
+
+def bench_scan_player_table_pts(ctx: Context):
+    table = PlayerTable.from_stats_csv(ctx.stats_csv())
+    res = {}
+    with timed(res):
+        sum(v or 0 for v in table.column('PTS'))
+    return len(table), res['seconds']
+
+
+def _bench_leaderboard(ctx: Context, stat: str, **kwargs):
+    eng = ctx.engine()
+    res = {}
+    with timed(res):
+        rows = leaderboard.top(stat, 10, db_engine=eng, **kwargs)
+    return len(rows), res['seconds'], {'table_rows': ctx.n}
+
+
+def bench_leaderboard_top10_pts(ctx: Context):
+    return _bench_leaderboard(ctx, 'PTS')
+
+
+def bench_leaderboard_top10_sh_pct(ctx: Context):
+    return _bench_leaderboard(ctx, 'SH_PCT', min_shots=20)
+
+
+def bench_leaderboard_top10_position(ctx: Context):
+    return _bench_leaderboard(ctx, 'PTS', position='Defense')
+
+
+def bench_leaderboard_top10_heap(ctx: Context):
+    return _bench_leaderboard(ctx, 'PTS_PER_GP', min_gp=10)
+
+
+def bench_leaderboard_full_sort(ctx: Context):
+    # the previous approach: load the whole Stats table and sort it
+    eng = ctx.engine()
+    res = {}
+    with timed(res):
+        with Session(eng) as session:
+            records = session.exec(select(Stats)).all()
+        if pd is not None:
+            pd.DataFrame([r.model_dump() for r in records]).sort_values('PTS', ascending=False).head(10)
+        else:
+            sorted(records, key=lambda r: r.PTS or 0, reverse=True)[:10]
+    return 10, res['seconds'], {'table_rows': ctx.n}
+
+
+def bench_leaderboard_cache_update(ctx: Context):
+    eng = ctx.engine()
+    cache = leaderboard.LeaderboardCache('PTS', 10, db_engine=eng)
+    cache.refresh()
+    rows = [s for _, s in zip(range(10000), synth.stats_rows(ctx.n, ctx.seed + 7))]
+    updates = [Stats(**{'first_name': r['first_name'], 'last_name': r['last_name'], 'PTS': int(r['PTS']),
+                        'GP': int(r['GP']), 'SH': int(r['SH']), 'jersey_number': int(r['jersey_number'])})
+               for r in rows]
+    res = {}
+    with timed(res):
+        for s in updates:
+            cache.observe(s)
+        cache.leaders()
+    return len(updates), res['seconds']
+
+
+BENCHMARKS = {
+    'parse_html': bench_parse_html,
+    'extract_stats_table': bench_extract_stats_table,
+    'load_bio_instances': bench_load_bio_instances,
+    'load_stats_instances': bench_load_stats_instances,
+    'init_bio': bench_init_bio,
+    'init_stats': bench_init_stats,
+    'read_roster': bench_read_roster,
+    'read_position_weight': bench_read_position_weight,
+    'query_roster': bench_query_roster,
+    'query_roster_stats': bench_query_roster_stats,
+    'stats_models_memory': bench_stats_models_memory,
+    'player_table_memory': bench_player_table_memory,
+    'player_table_from_query': bench_player_table_from_query,
+    'scan_models_pts': bench_scan_models_pts,
+    'scan_player_table_pts': bench_scan_player_table_pts,
+    'leaderboard_top10_pts': bench_leaderboard_top10_pts,
+    'leaderboard_top10_sh_pct': bench_leaderboard_top10_sh_pct,
+    'leaderboard_top10_position': bench_leaderboard_top10_position,
+    'leaderboard_top10_heap': bench_leaderboard_top10_heap,
+    'leaderboard_full_sort': bench_leaderboard_full_sort,
+    'leaderboard_cache_update': bench_leaderboard_cache_update,
+}
+
+
+def parse_size(label: str) -> int:
+    label = label.strip().lower()
+    mult = {'k': 1000, 'm': 1000000}.get(label[-1:], 1)
+    digits = label[:-1] if mult > 1 else label
+    return int(float(digits) * mult)
+
+
+def run(sizes: list, names: list, seed: int = 0, repeat: int = 3) -> dict:
+    """Run benchmarks `names` at each size label and return the results document."""
+    results = {}
+    for label in sizes:
+        n = parse_size(label)
+        workdir = tempfile.mkdtemp(prefix=f'hurst-bench-{label}-')
+        try:
+            ctx = Context(n, seed, workdir)
+            for name in names:
+                best = None
+                items = 0
+                extra = {}
+                for _ in range(repeat):
+                    items, seconds, *rest = BENCHMARKS[name](ctx)
+                    extra = rest[0] if rest else {}
+                    best = seconds if best is None else min(best, seconds)
+                key = f'{name}@{label}'
+                results[key] = {
+                    'benchmark': name,
+                    'size': n,
+                    'items': items,
+                    'seconds': round(best, 6),
+                    'items_per_sec': round(items / best, 1) if best else None,
+                    **extra,
+                }
+                notes = ''.join(f'  {k}={v:,}' for k, v in extra.items())
+                print(f"{key:<32} {best:>10.4f}s  {results[key]['items_per_sec'] or 0:>14,.0f} items/s{notes}", flush=True)
+            if ctx._engine is not None:
+                ctx._engine.dispose()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Return (key, baseline seconds, current seconds, ratio) for every regression."""
+    regressions = []
+    base = baseline.get('results', {})
+    for key, res in current['results'].items():
+        if key not in base:
+            continue
+        old, new = base[key]['seconds'], res['seconds']
+        if new - old > MIN_ABS_DELTA and new > old * (1 + threshold):
+            regressions.append((key, old, new, new / old if old else float('inf')))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ingest and query path on synthetic data')
+    parser.add_argument('--sizes', default='1k', help='Comma-separated player counts, e.g. 1k,100k,1m')
+    parser.add_argument('--only', help='Comma-separated benchmark names (default: all)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark; the fastest is kept')
+    parser.add_argument('--out', '-o', help='Write results JSON here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown before a result counts as a regression (0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true', help='Write these results to the baseline file')
+    parser.add_argument('--list', action='store_true', help='List benchmarks and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return
+
+    names = [n.strip() for n in args.only.split(',')] if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print('Unknown benchmark(s):', ', '.join(unknown), file=sys.stderr)
+        sys.exit(2)
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+
+    doc = run(sizes, names, seed=args.seed, repeat=max(1, args.repeat))
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as fh:
+            json.dump(doc, fh, indent=2, sort_keys=True)
+        print('Wrote', args.out)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as fh:
+            json.dump(doc, fh, indent=2, sort_keys=True)
+        print('Saved baseline to', args.baseline)
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        regressions = compare(doc, baseline, args.threshold)
+        for key, old, new, ratio in regressions:
+            print(f'REGRESSION {key}: {old:.4f}s -> {new:.4f}s ({ratio:.2f}x)', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions against {args.baseline} (threshold {args.threshold:.0%}).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Seeded generators for synthetic roster pages, stats tables and CSVs.
+
+Everything here is deterministic for a given seed so benchmark runs are
+comparable. Player names are unique per index, which keeps the Bio/Stats
+primary keys valid at any size.
+"""
+import csv
+import random
+
+BIO_FIELDNAMES = [
+    'first_name', 'last_name', 'position', 'jersey_number', 'weight', 'height', 'class_year', 'home_town', 'highschool'
+]
+STATS_FIELDNAMES = [
+    'jersey_number', 'first_name', 'last_name', 'G', 'GP', 'A', 'PTS', 'SH', 'SH_PCT', 'Plus_Minus', 'PPG', 'SHG',
+    'FG', 'GWG', 'GTG', 'OTG', 'HTG', 'UAG', 'PN-PIM', 'MIN', 'MAJ', 'OTH', 'BLK'
+]
+STATS_TABLE_HEADERS = [
+    '#', 'Player', 'GP', 'G', 'A', 'PTS', 'SH', 'SH%', '+/-', 'PPG', 'SHG', 'FG', 'GWG', 'GTG', 'OTG', 'HTG', 'UAG',
+    'PN-PIM', 'MIN', 'MAJ', 'OTH', 'BLK'
+]
+
+FIRST_NAMES = [
+    'Henry', 'Alexander', 'Andrew', 'Barrett', 'Brendan', 'Caleb', 'Charles-Edward', 'Christian', 'Connor',
+    'Dominik', 'Francesco', 'Jacob', 'Jaryd', 'Joey', 'John', 'Kaden', 'Lukas', 'Matteo', 'Noah', 'Riley',
+    'Ryan', 'Salvatore', 'Sean', 'Simon', 'Spencer', 'Trent', 'Tyler', 'Will', 'Michael', 'Émile',
+]
+LAST_SYLLABLES = ['bar', 'tec', 'ko', 'le', 'blanc', 'des', 'roch', 'ers', 'has', 'kins', 'mac', 'son', 'gra',
+                  'vel', 'kocs', 'is', 'pel', 'sch', 'umach', 'er', 'fitz', 'ger', 'ald', 'o', 'brien']
+POSITIONS = ['Forward'] * 13 + ['Defense'] * 8 + ['Goaltender'] * 3
+CLASS_YEARS = ['Freshman', 'Sophomore', 'Junior', 'Senior', 'Graduate']
+HOMETOWNS = ['Cedarburg, Wis.', 'Richmond Hill, Ontario', 'Nashville, Tn.', 'Stevens Point, Wi.', 'Erie, Pa.',
+             'Buffalo, N.Y.', 'Calgary, Alberta', 'Montreal, Quebec', 'Duluth, Minn.', 'Plano, Texas']
+TEAMS = ['Potomac Patriots', 'Sherwood Park Crusaders (BCHL)', 'New Jersey Titans (NAHL)',
+         'Madison Capitals (USHL)', 'Chicago Steel (USHL)', 'Penticton Vees (BCHL)', 'Wenatchee Wild (BCHL)']
+
+PLAYER_PAGE_TEMPLATE = """<div class="sidearm-roster-player-header-details ">
+    <div class="sidearm-roster-player-image-wrapper ">
+        <div class="sidearm-roster-player-image ">
+            <img src="/images/2025/9/4/{first}_{last}.jpg?width=146" alt="">
+        </div>
+        <h2 class="sidearm-roster-player-heading flex flex-align-center mobile--view">
+            <span class="sidearm-roster-player-jersey-number">
+               {jersey}
+            </span>
+            <span class="sidearm-roster-player-name ">
+                <span>{first}</span>
+                <span>{last}</span>
+            </span>
+            <div class="sidearm-roster-player-social flex flex-wrap">
+            </div>
+        </h2>
+    </div>
+    <div class="sidearm-roster-player-header-info-wrapper">
+        <div class="sidearm-roster-player-header-info">
+            <div class="sidearm-roster-player-fields flex flex-item-1">
+                <ul class="flex flex-item-1 row flex-wrap">
+{fields}
+                </ul>
+            </div>
+        </div>
+    </div>
+    <div class="clear"></div>
+</div>
+"""
+FIELD_TEMPLATE = """                    <li class="large-6 flex columns">
+                        <dl class="flex-item-1">
+                            <dt>{label}:</dt>
+                            <dd>{value}</dd>
+                        </dl>
+                    </li>
+"""
+
+
+def _index_suffix(i: int) -> str:
+    # base-26 letters make every generated last name unique
+    out = ''
+    while True:
+        i, r = divmod(i, 26)
+        out = chr(ord('a') + r) + out
+        if i == 0:
+            return out
+        i -= 1
+
+
+def make_name(rng: random.Random, i: int) -> tuple:
+    first = rng.choice(FIRST_NAMES)
+    last = ''.join(rng.choice(LAST_SYLLABLES) for _ in range(rng.randint(2, 3)))
+    if rng.random() < 0.1:
+        last = last + '-' + rng.choice(LAST_SYLLABLES)
+    return first, (last + _index_suffix(i)).capitalize()
+
+
+def bio_rows(n: int, seed: int = 0):
+    """Yield `n` bio dicts with the columns of bio.csv."""
+    rng = random.Random(seed)
+    for i in range(n):
+        first, last = make_name(rng, i)
+        row = {
+            'first_name': first,
+            'last_name': last,
+            'position': rng.choice(POSITIONS),
+            'jersey_number': str(rng.randint(1, 99)),
+            'weight': str(rng.randint(160, 225)),
+            'height': f'{rng.randint(5, 6)}-{rng.randint(0, 11)}',
+            'class_year': rng.choice(CLASS_YEARS),
+            'home_town': rng.choice(HOMETOWNS),
+            'highschool': rng.choice(TEAMS),
+        }
+        # roster pages occasionally omit fields
+        if rng.random() < 0.05:
+            row['highschool'] = ''
+        yield row
+
+
+def stats_rows(n: int, seed: int = 0):
+    """Yield `n` stats dicts with the columns of stats.csv, for the players of `bio_rows(n, seed)`."""
+    rng = random.Random(seed + 1)
+    for bio in bio_rows(n, seed):
+        gp = rng.randint(0, 36)
+        g = rng.randint(0, max(0, gp // 2))
+        a = rng.randint(0, max(0, gp // 2))
+        sh = rng.randint(g, g + 4 * gp + 1)
+        pn = rng.randint(0, 15)
+        yield {
+            'jersey_number': bio['jersey_number'],
+            'first_name': bio['first_name'],
+            'last_name': bio['last_name'],
+            'G': str(g),
+            'GP': str(gp),
+            'A': str(a),
+            'PTS': str(g + a),
+            'SH': str(sh),
+            'SH_PCT': f'{g / sh:.3f}'.lstrip('0') if sh else '.000',
+            'Plus_Minus': str(rng.randint(-20, 20)),
+            'PPG': str(rng.randint(0, g)),
+            'SHG': str(rng.randint(0, 1)),
+            'FG': str(rng.randint(0, g)),
+            'GWG': str(rng.randint(0, g)),
+            'GTG': '0',
+            'OTG': str(rng.randint(0, 1)),
+            'HTG': '0',
+            'UAG': str(rng.randint(0, 1)),
+            'PN-PIM': f'{pn}-{pn * 2 + rng.choice((0, 2, 4))}',
+            'MIN': str(pn),
+            'MAJ': str(rng.randint(0, 1)),
+            'OTH': str(rng.randint(0, 1)),
+            'BLK': str(rng.randint(0, 40)),
+        }
+
+
+def player_page(bio: dict) -> str:
+    """Render a Sidearm-style roster page for one bio dict."""
+    labels = [('Position', 'position'), ('Height', 'height'), ('Weight', 'weight'), ('Class', 'class_year'),
+              ('Hometown', 'home_town'), ('High School', 'highschool')]
+    fields = ''.join(FIELD_TEMPLATE.format(label=label, value=bio[key]) for label, key in labels if bio[key])
+    return PLAYER_PAGE_TEMPLATE.format(first=bio['first_name'], last=bio['last_name'],
+                                       jersey=bio['jersey_number'], fields=fields)
+
+
+def player_pages(n: int, seed: int = 0):
+    """Yield `n` roster page HTML strings."""
+    for bio in bio_rows(n, seed):
+        yield player_page(bio)
+
+
+def _table(caption: str, headers: list, rows) -> str:
+    parts = [f'<table class="sidearm-table"><caption>{caption}</caption><thead>',
+             '<tr><th scope="colgroup" colspan="3">Overall</th></tr><tr>']
+    parts.extend(f'<th scope="col">{h}</th>' for h in headers)
+    parts.append('</tr></thead><tbody>')
+    for r in rows:
+        parts.append('<tr>')
+        parts.extend(f'<td>{c}</td>' for c in r)
+        parts.append('</tr>\n')
+    parts.append('</tbody></table>')
+    return ''.join(parts)
+
+
+def stats_page(n: int, seed: int = 0) -> str:
+    """Render a stats page whose "Individual, Overall, Skaters" table has `n` rows."""
+    def skater_rows():
+        for s in stats_rows(n, seed):
+            name = f"{s['last_name'].lower()}, {s['first_name'].lower()}"
+            # the live feed repeats the name text inside the cell
+            player = f'<a href="#">{name}</a> <span class="hide">{name}</span>'
+            yield [s['jersey_number'], player, s['GP'], s['G'], s['A'], s['PTS'], s['SH'], s['SH_PCT'],
+                   s['Plus_Minus'], s['PPG'], s['SHG'], s['FG'], s['GWG'], s['GTG'], s['OTG'], s['HTG'], s['UAG'],
+                   s['PN-PIM'], s['MIN'], s['MAJ'], s['OTH'], s['BLK']]
+
+    team = _table('Team Statistics', ['Stat', 'Hurst', 'Opp'], [['Goals', '80', '95'], ['Shots', '900', '1010']])
+    skaters = _table('Individual, Overall, Skaters', STATS_TABLE_HEADERS, skater_rows())
+    goalies = _table('Individual, Overall, Goalies', ['#', 'Player', 'GP', 'GAA'], [['1', 'hunt, henry', '20', '2.91']])
+    return f'<html><body><h1>2025-26 Statistics</h1>{team}<section>{skaters}</section>{goalies}</body></html>'
+
+
+def write_csv(path: str, fieldnames: list, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.DictWriter(fh, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_bio_csv(path: str, n: int, seed: int = 0):
+    write_csv(path, BIO_FIELDNAMES, bio_rows(n, seed))
+
+
+def write_stats_csv(path: str, n: int, seed: int = 0):
+    write_csv(path, STATS_FIELDNAMES, stats_rows(n, seed))
@@ -1,8 +1,13 @@
-from typing import List
+from typing import Iterator, List
 import csv
 import os
+import time
 
+import metrics
 from models import Bio
+from names import name_key
+
+_NUMERIC_COLUMNS = ('jersey_number', 'weight')
 
 
 def _to_int(v: str):
@@ -17,22 +22,23 @@ def _to_int(v: str):
         return None
 
 
-def load_bio_instances(csv_path: str | None = None) -> List[Bio]:
-    """Load Bio instances from a CSV file and return a list of `Bio` objects.
+def iter_bio_rows(csv_path: str | None = None) -> Iterator[dict]:
+    """Yield one dict of converted `Bio` field values per CSV row.
 
-    By default reads `bio.csv` in the repository root. Fields that are empty
-    are converted to None and numeric fields are converted to int when possible.
+    Conversion matches `load_bio_instances` but no model objects are built,
+    which is what bulk consumers such as `PlayerTable` want.
     """
     if csv_path is None:
         csv_path = os.path.join(os.path.dirname(__file__), 'bio.csv')
 
-    instances: List[Bio] = []
     with open(csv_path, newline='', encoding='utf-8') as fh:
         reader = csv.DictReader(fh)
         for row in reader:
-            b = Bio(
-                first_name=(row.get('first_name') or '').strip() or None,
-                last_name=(row.get('last_name') or '').strip() or None,
+            first_name = (row.get('first_name') or '').strip() or None
+            last_name = (row.get('last_name') or '').strip() or None
+            values = dict(
+                first_name=first_name,
+                last_name=last_name,
                 position=(row.get('position') or '').strip() or None,
                 jersey_number=_to_int(row.get('jersey_number')),
                 weight=_to_int(row.get('weight')),
@@ -40,9 +46,28 @@ def load_bio_instances(csv_path: str | None = None) -> List[Bio]:
                 class_year=(row.get('class_year') or '').strip() or None,
                 home_town=(row.get('home_town') or '').strip() or None,
                 highschool=(row.get('highschool') or '').strip() or None,
+                name_key=name_key(first_name, last_name),
             )
-            instances.append(b)
+            if metrics.enabled():
+                for col in _NUMERIC_COLUMNS:
+                    if values[col] is None and (row.get(col) or '').strip():
+                        metrics.inc('load_conversion_failures_total', loader='bio', column=col)
+            yield values
+
+
+def load_bio_instances(csv_path: str | None = None) -> List[Bio]:
+    """Load Bio instances from a CSV file and return a list of `Bio` objects.
+
+    By default reads `bio.csv` in the repository root. Fields that are empty
+    are converted to None and numeric fields are converted to int when possible.
+    `name_key` is computed here so joins against Stats never normalize at
+    query time.
+    """
+    start = time.perf_counter()
+    instances: List[Bio] = [Bio(**values) for values in iter_bio_rows(csv_path)]
 
+    metrics.observe('load_seconds', time.perf_counter() - start, loader='bio')
+    metrics.inc('load_rows_total', len(instances), loader='bio')
     return instances
 
 
@@ -51,4 +76,4 @@ def get_bio_instances() -> List[Bio]:
     return load_bio_instances()
 
 
-__all__ = ["load_bio_instances", "get_bio_instances"]
+__all__ = ["iter_bio_rows", "load_bio_instances", "get_bio_instances"]
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Incremental game-by-game ingest with running totals and rolling windows.
+
+Each player's Sidearm "Game Log" table is parsed with the table helpers in
+`scripts/populate_stats.py`. Only games newer than the last one stored for
+that player are appended to `GameLog`, and the player's `RollingStats` row
+is updated in O(1) per game: totals add the new game, and the rolling
+window adds the new game and subtracts the one that falls out of it.
+Nothing is recomputed from history.
+
+Usage:
+  python3 gamelog.py --input bartecko.html --first Dominik --last Bartecko --season 2025
+  python3 gamelog.py --url https://hurstathletics.com/sports/mens-ice-hockey/roster/... --first X --last Y
+  python3 gamelog.py --show --first Dominik --last Bartecko
+  python3 gamelog.py --leaders PTS
+"""
+from collections import deque
+from datetime import datetime
+import argparse
+import re
+import sys
+
+from sqlmodel import Session, func, select
+
+import metrics
+from models import GameLog, RollingStats, engine
+from names import name_key
+from scripts.populate_stats import (
+    extract_body_rows,
+    extract_cells_from_tr,
+    extract_table_for_phrase,
+    fetch,
+    get_header_row_from_table,
+)
+
+DEFAULT_PHRASE = 'Game Log'
+DEFAULT_WINDOW = 5
+ROLLING_STATS = ('G', 'A', 'PTS', 'SH', 'Plus_Minus', 'PIM', 'BLK')
+
+# game log header label (lower-cased) -> GameLog field
+HEADER_MAP = {
+    'date': 'date',
+    'opponent': 'opponent',
+    'opp': 'opponent',
+    'g': 'G',
+    'a': 'A',
+    'pts': 'PTS',
+    'sh': 'SH',
+    '+/-': 'Plus_Minus',
+    'pim': 'PIM',
+    'pn-pim': 'PN_PIM',
+    'blk': 'BLK',
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%b %d, %Y', '%B %d, %Y')
+
+
+def _to_int(v: str | None):
+    if v is None:
+        return None
+    v = v.strip()
+    if v == '' or v == '-':
+        return None
+    try:
+        return int(v)
+    except ValueError:
+        return None
+
+
+def parse_game_date(s: str, season_start_year: int | None = None) -> str | None:
+    """Return `s` as an ISO date (YYYY-MM-DD), or None if it is not a date.
+
+    Dates without a year ('Oct 3') need `season_start_year`: August to
+    December fall in that year, January to July in the next.
+    """
+    s = re.sub(r'\s+', ' ', s or '').strip()
+    # drop weekday prefixes like 'Fri, Oct 3' or trailing '(DH)'
+    s = re.sub(r'^[A-Za-z]{3},\s*', '', s)
+    s = re.sub(r'\s*\(.*\)$', '', s)
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(s, fmt).date().isoformat()
+        except ValueError:
+            pass
+    if season_start_year is not None:
+        # parse with the year in place: on its own 'Feb 29' is checked against 1900 and rejected
+        for fmt in ('%b %d', '%B %d', '%m/%d'):
+            for year in (season_start_year, season_start_year + 1):
+                try:
+                    d = datetime.strptime(f'{s} {year}', f'{fmt} %Y')
+                except ValueError:
+                    continue
+                if (d.month >= 8) == (year == season_start_year):
+                    return d.date().isoformat()
+    return None
+
+
+def parse_game_log(html: str, phrase: str = DEFAULT_PHRASE, season_start_year: int | None = None) -> list:
+    """Extract one dict per game from the game log table in `html`.
+
+    Rows whose first column is not a date (totals, section headers) are
+    skipped. Games are returned oldest first and numbered as by
+    `number_games`.
+    """
+    table = extract_table_for_phrase(html, phrase)
+    if not table:
+        return []
+    tr = get_header_row_from_table(table)
+    if not tr:
+        return []
+    fields = [HEADER_MAP.get(h.strip().lower()) for h in extract_cells_from_tr(tr)]
+    games = []
+    for cells in extract_body_rows(table):
+        raw = {f: c for f, c in zip(fields, cells) if f}
+        game_date = parse_game_date(raw.get('date', ''), season_start_year)
+        if game_date is None:
+            continue
+        game = {'game_date': game_date, 'opponent': raw.get('opponent') or None}
+        for stat in ROLLING_STATS:
+            game[stat] = _to_int(raw.get(stat))
+        if game['PIM'] is None and raw.get('PN_PIM'):
+            # penalties-minutes, e.g. '2-4'
+            game['PIM'] = _to_int(raw['PN_PIM'].split('-')[-1])
+        if game['PTS'] is None and (game['G'] is not None or game['A'] is not None):
+            game['PTS'] = (game['G'] or 0) + (game['A'] or 0)
+        games.append(game)
+    return number_games(games)
+
+
+def number_games(games: list) -> list:
+    """Return `games` oldest first, each with 'game_no': its 1-based order on its date.
+
+    The sort is stable, so games sharing a date (a doubleheader) keep the
+    order they were listed in and get 1, 2, ...
+    """
+    per_date: dict = {}
+    numbered = []
+    for game in sorted(games, key=lambda g: g['game_date']):
+        per_date[game['game_date']] = per_date.get(game['game_date'], 0) + 1
+        numbered.append({**game, 'game_no': per_date[game['game_date']]})
+    return numbered
+
+
+def _game_id(game: dict) -> str:
+    # date and game number are unique per player; the opponent is for readability
+    return f"{game['game_date']}|{game['game_no']}|{game.get('opponent') or ''}"
+
+
+def _stat_values(obj) -> tuple:
+    if isinstance(obj, dict):
+        return tuple(obj.get(stat) or 0 for stat in ROLLING_STATS)
+    return tuple(getattr(obj, stat) or 0 for stat in ROLLING_STATS)
+
+
+def _recent_games(session: Session, key: str, window: int) -> list:
+    # one indexed range read of at most `window` rows, newest last
+    logs = session.exec(
+        select(GameLog).where(GameLog.name_key == key).order_by(GameLog.seq.desc()).limit(window)
+    ).all()
+    return [_stat_values(g) for g in reversed(logs)]
+
+
+def ingest_games(session: Session, first_name: str, last_name: str, games: list,
+                 window: int = DEFAULT_WINDOW) -> int:
+    """Append the games newer than the player's last stored game and update their RollingStats.
+
+    Games on the last stored date are matched by their order within that
+    date, so the second game of a doubleheader is still added after the
+    first. Returns the number of games added. The caller commits the session.
+    """
+    key = name_key(first_name, last_name)
+    if key is None:
+        raise ValueError('A player name is required')
+    rs = session.get(RollingStats, key)
+    if rs is None:
+        rs = RollingStats(name_key=key, first_name=first_name, last_name=last_name, window=window)
+        session.add(rs)
+
+    if rs.window != window:
+        # a different window size: rebuild the rolling sums once from the last `window` games
+        rs.window = window
+        recent = _recent_games(session, key, window)
+        for i, stat in enumerate(ROLLING_STATS):
+            setattr(rs, f'roll_{stat}', sum(v[i] for v in recent))
+
+    # games on the last stored date that are already in: the log lists them first on that date
+    stored_on_last_date = 0
+    if rs.last_game_date is not None:
+        stored_on_last_date = session.exec(
+            select(func.count()).select_from(GameLog)
+            .where(GameLog.name_key == key, GameLog.game_date == rs.last_game_date)
+        ).one()
+    new = [
+        g for g in number_games(games)
+        if rs.last_game_date is None
+        or g['game_date'] > rs.last_game_date
+        or (g['game_date'] == rs.last_game_date and g['game_no'] > stored_on_last_date)
+    ]
+    if not new:
+        return 0
+
+    recent = deque(_recent_games(session, key, window), maxlen=window)
+    for game in new:
+        values = _stat_values(game)
+        rs.games += 1
+        session.add(GameLog(
+            name_key=key,
+            seq=rs.games,
+            game_id=_game_id(game),
+            game_date=game['game_date'],
+            opponent=game.get('opponent'),
+            **{stat: game.get(stat) for stat in ROLLING_STATS},
+        ))
+        leaving = recent[0] if len(recent) == window else None
+        for i, stat in enumerate(ROLLING_STATS):
+            setattr(rs, stat, getattr(rs, stat) + values[i])
+            roll = getattr(rs, f'roll_{stat}') + values[i]
+            if leaving is not None:
+                roll -= leaving[i]
+            setattr(rs, f'roll_{stat}', roll)
+        recent.append(values)
+        rs.last_game_date = game['game_date']
+
+    metrics.inc('gamelog_games_ingested_total', len(new))
+    return len(new)
+
+
+def player_trend(session: Session, first_name: str, last_name: str) -> dict | None:
+    """Return current totals and rolling-window values for a player, or None if unknown."""
+    rs = session.get(RollingStats, name_key(first_name, last_name))
+    if rs is None:
+        return None
+    return {
+        'first_name': rs.first_name,
+        'last_name': rs.last_name,
+        'games': rs.games,
+        'last_game_date': rs.last_game_date,
+        'window': rs.window,
+        'totals': {stat: getattr(rs, stat) for stat in ROLLING_STATS},
+        'rolling': {stat: getattr(rs, f'roll_{stat}') for stat in ROLLING_STATS},
+    }
+
+
+def rolling_leaders(session: Session, stat: str = 'PTS', n: int = 10) -> list:
+    """Return (first_name, last_name, rolling value, games) for the top `n` players by rolling `stat`."""
+    if stat not in ROLLING_STATS:
+        raise ValueError(f'Unknown stat: {stat}')
+    column = getattr(RollingStats, f'roll_{stat}')
+    rows = session.exec(
+        select(RollingStats.first_name, RollingStats.last_name, column, RollingStats.games)
+        .order_by(column.desc())
+        .limit(n)
+    ).all()
+    return [tuple(r) for r in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest a player game log and maintain rolling stats')
+    parser.add_argument('--input', '-i', help='Saved player page HTML containing the game log')
+    parser.add_argument('--url', help='Player page URL to fetch')
+    parser.add_argument('--first', help='Player first name')
+    parser.add_argument('--last', help='Player last name')
+    parser.add_argument('--phrase', default=DEFAULT_PHRASE, help='Phrase identifying the game log table')
+    parser.add_argument('--season', type=int, help='Season start year, for dates shown without a year')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='Rolling window size in games')
+    parser.add_argument('--show', action='store_true', help='Print the player trend and exit')
+    parser.add_argument('--leaders', metavar='STAT', help='Print the rolling-window leaders for STAT and exit')
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        if args.leaders:
+            for first, last, value, games in rolling_leaders(session, args.leaders):
+                print(f'{first} {last}: {value} rolling {args.leaders} ({games} games)')
+            return
+        if not (args.first and args.last):
+            print('--first and --last are required', file=sys.stderr)
+            sys.exit(2)
+        if args.show:
+            trend = player_trend(session, args.first, args.last)
+            if trend is None:
+                print('No game log for', args.first, args.last, file=sys.stderr)
+                sys.exit(1)
+            print(trend)
+            return
+        if not (args.input or args.url):
+            print('One of --input or --url is required', file=sys.stderr)
+            sys.exit(2)
+
+        try:
+            if args.input:
+                with open(args.input, 'r', encoding='utf-8') as fh:
+                    html = fh.read()
+            else:
+                html = fetch(args.url)
+        except Exception as e:
+            print('Failed to load page/input:', e, file=sys.stderr)
+            sys.exit(2)
+
+        games = parse_game_log(html, args.phrase, args.season)
+        if not games:
+            print('No games found for phrase:', args.phrase, file=sys.stderr)
+            sys.exit(3)
+        with metrics.timer('gamelog_ingest_seconds'):
+            added = ingest_games(session, args.first, args.last, games, window=args.window)
+            session.commit()
+        print(f'Added {added} new games for {args.first} {args.last} ({len(games)} in log).')
+
+
+if __name__ == '__main__':
+    main()
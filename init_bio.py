@@ -1,12 +1,18 @@
 from sqlmodel import Session
 from bio_instances import get_bio_instances
-from models import Bio, engine
+from models import add_missing_columns, sync_rows, Bio, engine
+from names import backfill_name_keys
+import metrics
 
 
-with Session(engine) as session:
-    existing_bios = session.query(Bio).all()
-    if not existing_bios:
-        for bio in get_bio_instances():
-            session.add(bio)
-        session.commit()
+add_missing_columns(engine)
 
+with Session(engine) as session, metrics.profile('init_bio'):
+    # upsert from the CSV every run, so a changed file is always reflected
+    bios = get_bio_instances()
+    with metrics.timer('db_batch_seconds', table='bio'):
+        deleted = sync_rows(session, Bio, bios)
+        session.commit()
+    metrics.inc('db_rows_written_total', len(bios), table='bio')
+    metrics.inc('db_rows_deleted_total', deleted, table='bio')
+    backfill_name_keys(session)
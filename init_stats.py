@@ -1,12 +1,20 @@
 from sqlmodel import Session
 from stats_instances import get_stats_instances
-from models import engine, Stats
+from models import add_missing_columns, sync_rows, engine, Stats
+from names import backfill_name_keys, resolve_aliases
+import metrics
 
 
-with Session(engine) as session:
-    existing_stats = session.query(Stats).all()
-    if not existing_stats:
-        for stat in get_stats_instances():
-            session.add(stat)
-        session.commit()
+add_missing_columns(engine)
 
+with Session(engine) as session, metrics.profile('init_stats'):
+    # upsert from the CSV every run, so a changed file is always reflected
+    stats = get_stats_instances()
+    with metrics.timer('db_batch_seconds', table='stats'):
+        deleted = sync_rows(session, Stats, stats)
+        session.commit()
+    metrics.inc('db_rows_written_total', len(stats), table='stats')
+    metrics.inc('db_rows_deleted_total', deleted, table='stats')
+    backfill_name_keys(session)
+    with metrics.timer('alias_resolve_seconds'):
+        metrics.inc('alias_rows_written_total', resolve_aliases(session))
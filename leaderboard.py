@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Top-N / bottom-N leaderboards over `models.Stats`.
+
+Stored stats (PTS, G, SH_PCT, Plus_Minus, BLK, ...) are answered in SQL:
+the indexed stat column is walked in order with a LIMIT, so a top-10 reads
+about ten index entries instead of sorting the table. Derived stats that
+have no column (points per game, ...) are selected with a bounded heap
+over streamed rows, which holds only N rows at a time. `LeaderboardCache`
+keeps a leaderboard current as Stats changes are committed during ingest.
+
+Usage:
+  python3 leaderboard.py PTS
+  python3 leaderboard.py SH_PCT --min-shots 20 -n 5
+  python3 leaderboard.py Plus_Minus --bottom --position Defense
+  python3 leaderboard.py PTS_PER_GP --min-gp 10
+"""
+from bisect import insort
+from types import SimpleNamespace
+import argparse
+import heapq
+import sys
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from models import Bio, Stats, engine
+from names import join_bio_stats
+from query import connect, stream_rows
+
+DEFAULT_N = 10
+
+NUMERIC_STATS = (
+    'G', 'GP', 'A', 'PTS', 'SH', 'SH_PCT', 'Plus_Minus', 'PPG', 'SHG', 'FG', 'GWG', 'GTG', 'OTG', 'HTG', 'UAG',
+    'MIN', 'MAJ', 'OTH', 'BLK',
+)
+
+
+def _per_game(stat: str):
+    def value(row):
+        gp = row.GP
+        v = getattr(row, stat)
+        return v / gp if gp and v is not None else None
+    return value
+
+
+# stats with no column of their own, computed per row in Python
+DERIVED_STATS = {
+    'PTS_PER_GP': _per_game('PTS'),
+    'G_PER_GP': _per_game('G'),
+    'BLK_PER_GP': _per_game('BLK'),
+}
+
+
+def top_n(rows, key, n: int = DEFAULT_N, bottom: bool = False) -> list:
+    """Return the `n` best rows by `key` (largest, or smallest with `bottom`).
+
+    Rows whose key is None are ignored. Uses a heap bounded at `n`, so memory
+    stays O(n) however many rows are streamed in.
+    """
+    keyed = ((k, row) for row in rows for k in (key(row),) if k is not None)
+    pick = heapq.nsmallest if bottom else heapq.nlargest
+    return [row for _, row in pick(n, keyed, key=lambda kr: kr[0])]
+
+
+def _qualified(statement, min_shots: int | None, min_gp: int | None, position: str | None,
+               class_year: str | None):
+    # the team-totals line in stats.csv ('-tm', Team Team) has no jersey number
+    statement = statement.where(Stats.jersey_number.is_not(None))
+    if min_shots is not None:
+        statement = statement.where(Stats.SH >= min_shots)
+    if min_gp is not None:
+        statement = statement.where(Stats.GP >= min_gp)
+    if position:
+        statement = statement.where(Bio.position == position)
+    if class_year:
+        statement = statement.where(Bio.class_year == class_year)
+    return statement
+
+
+def _base_select(columns: list, position: str | None, class_year: str | None):
+    if position or class_year:
+        return join_bio_stats(*columns)
+    return select(*columns)
+
+
+def top(stat: str, n: int = DEFAULT_N, bottom: bool = False, min_shots: int | None = None,
+        min_gp: int | None = None, position: str | None = None, class_year: str | None = None,
+        db_engine=None) -> list:
+    """Return up to `n` leaders for `stat` as dicts of first_name, last_name, value.
+
+    `min_shots` / `min_gp` are qualifiers (e.g. SH_PCT with at least 20
+    shots); `position` / `class_year` filter through the Bio join. Rows with
+    no value for `stat`, and non-player rows such as team totals (no
+    jersey number), never qualify.
+    """
+    db_engine = db_engine or engine
+    names = [Stats.first_name, Stats.last_name]
+
+    if stat in NUMERIC_STATS:
+        column = getattr(Stats, stat)
+        statement = _base_select(names + [column.label('value')], position, class_year)
+        statement = _qualified(statement.where(column.is_not(None)), min_shots, min_gp, position, class_year)
+        order = column.asc() if bottom else column.desc()
+        statement = statement.order_by(order, Stats.last_name, Stats.first_name).limit(n)
+        with connect(db_engine) as conn:
+            return [dict(r._mapping) for r in conn.execute(statement)]
+
+    if stat in DERIVED_STATS:
+        value = DERIVED_STATS[stat]
+        statement = _base_select(names + [getattr(Stats, s) for s in NUMERIC_STATS], position, class_year)
+        statement = _qualified(statement, min_shots, min_gp, position, class_year)
+        rows = (row for _, chunk in stream_rows(statement, db_engine=db_engine) for row in chunk)
+
+        def order(row):
+            # ties broken by name, as in the SQL path
+            v = value(row)
+            return None if v is None else (v if bottom else -v, row.last_name, row.first_name)
+        best = top_n(rows, order, n, bottom=True)
+        return [{'first_name': r.first_name, 'last_name': r.last_name, 'value': value(r)} for r in best]
+
+    raise ValueError(f'Unknown stat: {stat}')
+
+
+class LeaderboardCache:
+    """A top-N leaderboard kept current as Stats rows change.
+
+    Holds the best `n + slack` entries in sorted order. An update costs a
+    binary insertion; only when removals leave fewer than `n` entries while
+    better rows may exist outside the cache is it refilled from the database.
+    Qualifiers are limited to what a Stats row carries (`min_shots`,
+    `min_gp`); position/class filters need `top()`.
+    """
+
+    def __init__(self, stat: str, n: int = DEFAULT_N, bottom: bool = False, min_shots: int | None = None,
+                 min_gp: int | None = None, slack: int | None = None, db_engine=None):
+        if stat not in NUMERIC_STATS and stat not in DERIVED_STATS:
+            raise ValueError(f'Unknown stat: {stat}')
+        self.stat = stat
+        self.n = n
+        self.bottom = bottom
+        self.min_shots = min_shots
+        self.min_gp = min_gp
+        self.capacity = n + (slack if slack is not None else n)
+        self.db_engine = db_engine
+        # sorted list of (sort value, last_name, first_name, value); best first
+        self._entries: list = []
+        self._members: dict = {}
+        # True once rows have been dropped for lack of room, so the cache may not hold everything
+        self._truncated = False
+        self._stale = True
+
+    def _value(self, row):
+        if self.stat in DERIVED_STATS:
+            return DERIVED_STATS[self.stat](row)
+        return getattr(row, self.stat)
+
+    def _qualifies(self, row) -> bool:
+        if row.jersey_number is None:
+            return False
+        if self.min_shots is not None and (row.SH is None or row.SH < self.min_shots):
+            return False
+        if self.min_gp is not None and (row.GP is None or row.GP < self.min_gp):
+            return False
+        return True
+
+    def _entry(self, first_name: str, last_name: str, value) -> tuple:
+        return (value if self.bottom else -value, last_name, first_name, value)
+
+    def refresh(self, bind=None):
+        """Reload the cached entries from the database (or from `bind`, an open connection)."""
+        rows = top(self.stat, self.capacity, self.bottom, self.min_shots, self.min_gp,
+                   db_engine=bind or self.db_engine)
+        self._entries = sorted(self._entry(r['first_name'], r['last_name'], r['value']) for r in rows)
+        self._members = {(e[2], e[1]): e for e in self._entries}
+        self._truncated = len(rows) >= self.capacity
+        self._stale = False
+
+    def discard(self, first_name: str, last_name: str):
+        entry = self._members.pop((first_name, last_name), None)
+        if entry is None:
+            return
+        self._entries.remove(entry)
+        if self._truncated and len(self._entries) < self.n:
+            self._stale = True
+
+    def observe(self, row):
+        """Apply an inserted or updated Stats row."""
+        self.discard(row.first_name, row.last_name)
+        value = self._value(row) if self._qualifies(row) else None
+        if value is None:
+            return
+        entry = self._entry(row.first_name, row.last_name, value)
+        if self._truncated and (not self._entries or entry > self._entries[-1]):
+            # rows outside the cache may rank ahead of this one, so it cannot be placed
+            if len(self._entries) < self.n:
+                self._stale = True
+            return
+        insort(self._entries, entry)
+        self._members[(row.first_name, row.last_name)] = entry
+        if len(self._entries) > self.capacity:
+            dropped = self._entries.pop()
+            del self._members[(dropped[2], dropped[1])]
+            self._truncated = True
+
+    def leaders(self) -> list:
+        """Return the current top `n` as dicts of first_name, last_name, value."""
+        if self._stale:
+            self.refresh()
+        return [{'first_name': e[2], 'last_name': e[1], 'value': e[3]} for e in self._entries[:self.n]]
+
+
+_tracked: list = []
+_listening = False
+# session.info keys: Stats changes flushed in the open transaction, and whether a savepoint rolled back
+_PENDING = 'leaderboard_pending'
+_PARTIAL_ROLLBACK = 'leaderboard_partial_rollback'
+_ROW_FIELDS = ('first_name', 'last_name', 'jersey_number') + NUMERIC_STATS
+
+
+def _engine_of(bind):
+    return getattr(bind, 'engine', bind)
+
+
+def _caches_for(session) -> list:
+    """The tracked caches that read from the database `session` is bound to."""
+    try:
+        bind = _engine_of(session.get_bind())
+    except Exception:
+        return []
+    return [c for c in _tracked if _engine_of(c.db_engine or engine) is bind]
+
+
+def _after_flush(session, flush_context):
+    if not _tracked:
+        return
+    # snapshot now: the objects are expired (or gone) by the time the transaction commits
+    pending = session.info.setdefault(_PENDING, [])
+    for obj in session.deleted:
+        if isinstance(obj, Stats):
+            pending.append((obj.first_name, obj.last_name, None))
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Stats):
+            row = SimpleNamespace(**{f: getattr(obj, f) for f in _ROW_FIELDS})
+            pending.append((obj.first_name, obj.last_name, row))
+
+
+def _after_soft_rollback(session, previous_transaction):
+    if previous_transaction.nested:
+        # some flushed changes were undone but not which ones; refill on commit
+        session.info[_PARTIAL_ROLLBACK] = True
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING, None)
+    partial = session.info.pop(_PARTIAL_ROLLBACK, False)
+    if not pending and not partial:
+        return
+    for cache in _caches_for(session):
+        if partial:
+            cache._stale = True
+            continue
+        for first_name, last_name, row in pending:
+            if row is None:
+                cache.discard(first_name, last_name)
+            else:
+                cache.observe(row)
+
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        # committed changes were applied in after_commit; anything left was rolled back
+        session.info.pop(_PENDING, None)
+        session.info.pop(_PARTIAL_ROLLBACK, None)
+
+
+def track(cache: LeaderboardCache) -> LeaderboardCache:
+    """Keep `cache` updated from committed Session transactions on its engine.
+
+    Stats changes are collected at each flush and applied when the
+    transaction commits; a rollback discards them.
+    """
+    global _listening
+    if not _listening:
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'after_soft_rollback', _after_soft_rollback)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_transaction_end', _after_transaction_end)
+        _listening = True
+    if cache._stale:
+        cache.refresh()
+    if cache not in _tracked:
+        _tracked.append(cache)
+    return cache
+
+
+def untrack(cache: LeaderboardCache):
+    if cache in _tracked:
+        _tracked.remove(cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print a Stats leaderboard')
+    parser.add_argument('stat', help='Stat column (e.g. PTS, G, SH_PCT, Plus_Minus, BLK) or derived stat')
+    parser.add_argument('-n', type=int, default=DEFAULT_N, help='Number of players')
+    parser.add_argument('--bottom', action='store_true', help='Lowest values first')
+    parser.add_argument('--min-shots', type=int, help='Qualifier: minimum shots (SH)')
+    parser.add_argument('--min-gp', type=int, help='Qualifier: minimum games played')
+    parser.add_argument('--position', help='Only players at this position')
+    parser.add_argument('--class-year', help='Only players in this class year')
+    args = parser.parse_args()
+
+    try:
+        rows = top(args.stat, args.n, args.bottom, args.min_shots, args.min_gp, args.position, args.class_year)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        print('Stats:', ', '.join(NUMERIC_STATS + tuple(DERIVED_STATS)), file=sys.stderr)
+        sys.exit(2)
+    for rank, r in enumerate(rows, 1):
+        value = f"{r['value']:.3f}" if isinstance(r['value'], float) else r['value']
+        name = f"{r['first_name']} {r['last_name']}"
+        print(f'{rank:>3}. {name:<28} {value}')
+
+
+if __name__ == '__main__':
+    main()
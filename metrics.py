@@ -0,0 +1,299 @@
+"""Lightweight counters, timers and profiling hooks for the ingest scripts.
+
+Instrumentation is off by default and every call returns immediately while
+disabled. Setting HURST_METRICS=<dir> in the environment turns it on and
+dumps `<dir>/<script>.json` and `<dir>/<script>.prom` (Prometheus text
+format) when the process exits. HURST_PROFILE=<stage>[,<stage>...] (or
+`all`) profiles the named stages with cProfile, or with a sampling
+profiler when HURST_PROFILE_MODE=sample.
+
+    import metrics
+
+    with metrics.timer('crawl_fetch_seconds'):
+        html = fetch_url(url)
+    metrics.inc('crawl_pages_fetched_total')
+    metrics.inc('load_conversion_failures_total', loader='stats', column='G')
+"""
+from collections import Counter
+from contextlib import contextmanager
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+PREFIX = 'hurst_'
+# upper bounds in seconds; chosen to cover both per-row and per-page latencies
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_enabled = False
+_lock = threading.Lock()
+_counters: dict = {}
+_histograms: dict = {}
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Add `value` to counter `name`."""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels):
+    """Record one observation (usually seconds) in histogram `name`."""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = _Histogram()
+        hist.observe(value)
+
+
+class _Timer:
+    __slots__ = ('name', 'labels', 'start')
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+def timer(name: str, **labels):
+    """Context manager that records its elapsed time in histogram `name`."""
+    if not _enabled:
+        return _NOOP_TIMER
+    return _Timer(name, labels)
+
+
+def snapshot() -> dict:
+    """Return all counters and histograms as plain JSON-serializable data."""
+    with _lock:
+        counters = [
+            {'name': name, 'labels': dict(labels), 'value': value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        histograms = [
+            {
+                'name': name,
+                'labels': dict(labels),
+                'count': h.count,
+                'sum': h.sum,
+                'buckets': dict(zip([str(b) for b in h.buckets], h.counts)),
+            }
+            for (name, labels), h in sorted(_histograms.items())
+        ]
+    return {'counters': counters, 'histograms': histograms}
+
+
+def dump_json(path: str):
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(snapshot(), fh, indent=2)
+
+
+def _fmt_labels(labels: dict, extra: dict | None = None) -> str:
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    body = ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in items)
+    return '{' + body + '}'
+
+
+def prometheus_text() -> str:
+    lines = []
+    typed = set()
+    with _lock:
+        for (name, labels), value in sorted(_counters.items()):
+            metric = PREFIX + name
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} counter')
+                typed.add(metric)
+            lines.append(f'{metric}{_fmt_labels(dict(labels))} {value}')
+        for (name, labels), h in sorted(_histograms.items()):
+            metric = PREFIX + name
+            labels = dict(labels)
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} histogram')
+                typed.add(metric)
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{_fmt_labels(labels, {"le": bound})} {cumulative}')
+            lines.append(f'{metric}_bucket{_fmt_labels(labels, {"le": "+Inf"})} {h.count}')
+            lines.append(f'{metric}_sum{_fmt_labels(labels)} {h.sum}')
+            lines.append(f'{metric}_count{_fmt_labels(labels)} {h.count}')
+    return '\n'.join(lines) + '\n'
+
+
+def dump_prometheus(path: str):
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(prometheus_text())
+
+
+class _Sampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval and counts stacks."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _profiled_stages() -> set:
+    return {s.strip() for s in os.environ.get('HURST_PROFILE', '').split(',') if s.strip()}
+
+
+def _output_dir() -> str:
+    return os.environ.get('HURST_METRICS') or os.getcwd()
+
+
+@contextmanager
+def profile(stage: str):
+    """Profile the enclosed block when `stage` is listed in HURST_PROFILE.
+
+    cProfile output goes to `<stage>.prof`; sampling output (collapsed
+    stacks with counts, flamegraph-compatible) to `<stage>.samples.txt`.
+    """
+    stages = _profiled_stages()
+    if not stages or (stage not in stages and 'all' not in stages):
+        yield
+        return
+    out_dir = _output_dir()
+    os.makedirs(out_dir, exist_ok=True)
+    if os.environ.get('HURST_PROFILE_MODE', 'cprofile') == 'sample':
+        sampler = _Sampler(threading.get_ident())
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            with open(os.path.join(out_dir, f'{stage}.samples.txt'), 'w', encoding='utf-8') as fh:
+                for stack, count in sampler.stacks.most_common():
+                    fh.write(f'{stack} {count}\n')
+    else:
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            prof.dump_stats(os.path.join(out_dir, f'{stage}.prof'))
+
+
+def _dump_at_exit(out_dir: str, name: str):
+    os.makedirs(out_dir, exist_ok=True)
+    dump_json(os.path.join(out_dir, f'{name}.json'))
+    dump_prometheus(os.path.join(out_dir, f'{name}.prom'))
+
+
+def configure_from_env():
+    """Enable metrics and register the exit-time dump if HURST_METRICS is set."""
+    out_dir = os.environ.get('HURST_METRICS')
+    if not out_dir:
+        return
+    enable()
+    name = os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0] or 'python'
+    atexit.register(_dump_at_exit, out_dir, name)
+
+
+configure_from_env()
+
+
+__all__ = [
+    "enabled",
+    "enable",
+    "disable",
+    "reset",
+    "inc",
+    "observe",
+    "timer",
+    "snapshot",
+    "dump_json",
+    "dump_prometheus",
+    "prometheus_text",
+    "profile",
+]
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel,Field,create_engine
+from sqlalchemy import delete, inspect, select, text
 
 class Bio(SQLModel, table = True):
     first_name: str = Field(default = None, primary_key = True)
@@ -10,18 +11,19 @@ class Bio(SQLModel, table = True):
     class_year: str | None = None
     home_town: str | None = None
     highschool: str | None = None
+    name_key: str | None = Field(default = None, index = True)
 
 class Stats(SQLModel, table = True):
     jersey_number: int | None = None
     first_name: str = Field(default = None, foreign_key="bio.first_name", primary_key = True)
     last_name: str = Field(default = None, foreign_key="bio.last_name", primary_key = True)
-    G: int | None = None
+    G: int | None = Field(default = None, index = True)
     GP: int | None = None
     A: int | None = None
-    PTS: int | None = None
+    PTS: int | None = Field(default = None, index = True)
     SH: int | None = None
-    SH_PCT: float | None = None
-    Plus_Minus: int | None = None
+    SH_PCT: float | None = Field(default = None, index = True)
+    Plus_Minus: int | None = Field(default = None, index = True)
     PPG: int | None = None
     SHG: int | None = None
     FG: int | None = None
@@ -34,7 +36,92 @@ class Stats(SQLModel, table = True):
     MIN: int | None = None
     MAJ: int | None = None
     OTH: int | None = None
+    BLK: int | None = Field(default = None, index = True)
+    name_key: str | None = Field(default = None, index = True)
+
+class NameAlias(SQLModel, table = True):
+    alias_key: str = Field(default = None, primary_key = True)
+    name_key: str = Field(default = None, index = True)
+    score: float | None = None
+
+class GameLog(SQLModel, table = True):
+    name_key: str = Field(default = None, primary_key = True)
+    seq: int = Field(default = None, primary_key = True)
+    game_id: str | None = None
+    game_date: str | None = Field(default = None, index = True)
+    opponent: str | None = None
+    G: int | None = None
+    A: int | None = None
+    PTS: int | None = None
+    SH: int | None = None
+    Plus_Minus: int | None = None
+    PIM: int | None = None
     BLK: int | None = None
 
+class RollingStats(SQLModel, table = True):
+    name_key: str = Field(default = None, primary_key = True)
+    first_name: str | None = None
+    last_name: str | None = None
+    games: int = 0
+    last_game_date: str | None = None
+    window: int = 5
+    G: int = 0
+    A: int = 0
+    PTS: int = 0
+    SH: int = 0
+    Plus_Minus: int = 0
+    PIM: int = 0
+    BLK: int = 0
+    roll_G: int = 0
+    roll_A: int = 0
+    roll_PTS: int = 0
+    roll_SH: int = 0
+    roll_Plus_Minus: int = 0
+    roll_PIM: int = 0
+    roll_BLK: int = 0
+
+
+def add_missing_columns(engine):
+    """Add nullable columns and indexes declared on the models but missing from an existing database.
+
+    `create_all` only creates missing tables, so databases built before a
+    column was added are upgraded here in place.
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c['name'] for c in insp.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def sync_rows(session, model, instances: list) -> int:
+    """Make `model`'s table hold exactly `instances`, matched on primary key.
+
+    New rows are inserted, changed rows updated and rows missing from
+    `instances` deleted; unchanged rows are left alone, so reloading the
+    same data writes nothing. Returns the number of rows deleted. The
+    caller commits.
+    """
+    mapper = inspect(model)
+    # load the table once so merge() finds existing rows in the identity map
+    existing = session.execute(select(model)).scalars().all()
+    keep = set()
+    for obj in instances:
+        keep.add(tuple(mapper.primary_key_from_instance(obj)))
+        session.merge(obj)
+    stale = [tuple(mapper.primary_key_from_instance(obj)) for obj in existing]
+    stale = [key for key in stale if key not in keep]
+    for key in stale:
+        session.execute(delete(model).where(*[col == v for col, v in zip(mapper.primary_key, key)]))
+    return len(stale)
+
 engine = create_engine('sqlite:///hockey.db')
 SQLModel.metadata.create_all(engine)
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""Normalized player-name keys and the alias table used to join Bio and Stats.
+
+The roster feed and the stats feed spell names differently (`LeBlanc` vs
+`Leblanc`, accents, hyphens), so rows are joined on `name_key` rather than
+on (first_name, last_name). The key is computed once at ingest and indexed;
+names that only match approximately are resolved in bulk into `NameAlias`.
+"""
+from difflib import SequenceMatcher
+from functools import lru_cache
+import re
+import unicodedata
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from models import Bio, NameAlias, Stats
+
+# Number of leading last-name characters used to block candidate matches.
+BLOCK_PREFIX_LEN = 3
+DEFAULT_ALIAS_THRESHOLD = 0.85
+
+
+def _normalize_part(s: str | None) -> str:
+    if not s:
+        return ''
+    s = unicodedata.normalize('NFKD', s)
+    s = ''.join(ch for ch in s if not unicodedata.combining(ch))
+    s = s.casefold()
+    # apostrophes and periods vanish (O'Brien -> obrien, St. John -> st john)
+    s = re.sub(r"['’.]", '', s)
+    # hyphens, underscores and any whitespace run collapse to one space
+    s = re.sub(r'[\s\-_]+', ' ', s)
+    return s.strip()
+
+
+@lru_cache(maxsize=65536)
+def name_key(first_name: str | None, last_name: str | None) -> str | None:
+    """Return the normalized join key for a player, e.g. 'leblanc|jacob'.
+
+    Last name comes first so that key prefixes block by last name.
+    """
+    first = _normalize_part(first_name)
+    last = _normalize_part(last_name)
+    if not first and not last:
+        return None
+    return f'{last}|{first}'
+
+
+def backfill_name_keys(session: Session) -> int:
+    """Compute `name_key` for Bio/Stats rows that were stored without one."""
+    updated = 0
+    for model in (Bio, Stats):
+        rows = session.exec(
+            select(model.first_name, model.last_name).where(model.name_key.is_(None))
+        ).all()
+        for first, last in rows:
+            session.execute(
+                update(model)
+                .where(model.first_name == first, model.last_name == last)
+                .values(name_key=name_key(first, last))
+            )
+        updated += len(rows)
+    session.commit()
+    return updated
+
+
+def _similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def resolve_aliases(session: Session, threshold: float = DEFAULT_ALIAS_THRESHOLD) -> int:
+    """Map Stats name keys with no exact Bio match to their closest Bio key.
+
+    Candidates are only compared within the same last-name prefix block, so
+    the cost is proportional to block size rather than the whole roster.
+    Matches scoring at least `threshold` are stored in `NameAlias`; returns
+    the number of aliases added.
+    """
+    bio_keys = {k for k in session.exec(select(Bio.name_key).where(Bio.name_key.is_not(None)))}
+    known = {k for k in session.exec(select(NameAlias.alias_key))}
+    stats_keys = {k for k in session.exec(select(Stats.name_key).where(Stats.name_key.is_not(None)))}
+    unmatched = stats_keys - bio_keys - known
+
+    blocks: dict[str, list[str]] = {}
+    for key in bio_keys:
+        blocks.setdefault(key[:BLOCK_PREFIX_LEN], []).append(key)
+
+    added = 0
+    for key in sorted(unmatched):
+        best, best_score = None, 0.0
+        for candidate in blocks.get(key[:BLOCK_PREFIX_LEN], ()):
+            score = _similarity(key, candidate)
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is not None and best_score >= threshold:
+            session.add(NameAlias(alias_key=key, name_key=best, score=round(best_score, 4)))
+            added += 1
+    session.commit()
+    return added
+
+
+def canonical_stats_key():
+    """SQL expression for the Bio key a Stats row resolves to (alias or exact)."""
+    return func.coalesce(NameAlias.name_key, Stats.name_key)
+
+
+def join_bio_stats(*columns):
+    """Return a select of `columns` over Stats joined to Bio through `name_key`.
+
+    Each Stats row costs one indexed alias lookup and one indexed Bio lookup.
+    """
+    return (
+        select(*columns)
+        .select_from(Stats)
+        .outerjoin(NameAlias, NameAlias.alias_key == Stats.name_key)
+        .join(Bio, Bio.name_key == canonical_stats_key())
+    )
+
+
+__all__ = [
+    "name_key",
+    "backfill_name_keys",
+    "resolve_aliases",
+    "canonical_stats_key",
+    "join_bio_stats",
+]
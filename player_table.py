@@ -0,0 +1,360 @@
+"""Compact, column-oriented in-memory store for rosters and stat lines.
+
+A list of `Bio`/`Stats` models pays for pydantic validation state and a
+per-instance dict on every player. `PlayerTable` instead keeps one typed
+`array` per numeric column, dictionary-encodes repeated strings such as
+position, class_year and home_town, and hands out `PlayerRow` views that
+are two slots wide.
+
+    table = PlayerTable.from_stats_csv('stats.csv')
+    best = max(table, key=lambda r: r.PTS or 0)
+    total_goals = sum(v for v in table.column('G') if v is not None)
+"""
+from array import array
+import math
+import sys
+
+from sqlalchemy import Boolean, Float, Integer, Numeric
+from sqlalchemy.types import NullType
+
+from bio_instances import iter_bio_rows
+from query import stream_rows
+from stats_instances import iter_stats_rows
+
+INT = 'int'
+FLOAT = 'float'
+CATEGORY = 'category'
+STR = 'str'
+
+BIO_SCHEMA = {
+    'first_name': STR,
+    'last_name': STR,
+    'position': CATEGORY,
+    'jersey_number': INT,
+    'weight': INT,
+    'height': CATEGORY,
+    'class_year': CATEGORY,
+    'home_town': CATEGORY,
+    'highschool': CATEGORY,
+    'name_key': STR,
+}
+
+STATS_SCHEMA = {
+    'jersey_number': INT,
+    'first_name': STR,
+    'last_name': STR,
+    'G': INT,
+    'GP': INT,
+    'A': INT,
+    'PTS': INT,
+    'SH': INT,
+    'SH_PCT': FLOAT,
+    'Plus_Minus': INT,
+    'PPG': INT,
+    'SHG': INT,
+    'FG': INT,
+    'GWG': INT,
+    'GTG': INT,
+    'OTG': INT,
+    'HTG': INT,
+    'UAG': INT,
+    'PN_PIM': CATEGORY,
+    'MIN': INT,
+    'MAJ': INT,
+    'OTH': INT,
+    'BLK': INT,
+    'name_key': STR,
+}
+
+
+class IntColumn:
+    """Signed 64-bit integers with a one-byte-per-row null mask."""
+
+    __slots__ = ('data', 'nulls')
+
+    def __init__(self):
+        self.data = array('q')
+        self.nulls = bytearray()
+
+    def append(self, value):
+        if value is None:
+            self.data.append(0)
+            self.nulls.append(1)
+        else:
+            self.data.append(value)
+            self.nulls.append(0)
+
+    def get(self, i: int):
+        return None if self.nulls[i] else self.data[i]
+
+    def set(self, i: int, value):
+        if value is None:
+            self.data[i] = 0
+            self.nulls[i] = 1
+        else:
+            self.data[i] = value
+            self.nulls[i] = 0
+
+    def values(self) -> list:
+        return [None if n else v for v, n in zip(self.data, self.nulls)]
+
+    def nbytes(self) -> int:
+        return self.data.itemsize * len(self.data) + len(self.nulls)
+
+
+class FloatColumn:
+    """Doubles; None is stored as NaN."""
+
+    __slots__ = ('data',)
+
+    def __init__(self):
+        self.data = array('d')
+
+    def append(self, value):
+        self.data.append(math.nan if value is None else value)
+
+    def get(self, i: int):
+        v = self.data[i]
+        return None if v != v else v
+
+    def set(self, i: int, value):
+        self.data[i] = math.nan if value is None else value
+
+    def values(self) -> list:
+        return [None if v != v else v for v in self.data]
+
+    def nbytes(self) -> int:
+        return self.data.itemsize * len(self.data)
+
+
+class CategoryColumn:
+    """Dictionary-encoded strings: each distinct value is stored once, rows hold a code (-1 = None)."""
+
+    __slots__ = ('codes', 'categories', 'lookup')
+
+    def __init__(self):
+        self.codes = array('i')
+        self.categories: list = []
+        self.lookup: dict = {}
+
+    def encode(self, value) -> int:
+        if value is None:
+            return -1
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def get(self, i: int):
+        code = self.codes[i]
+        return None if code < 0 else self.categories[code]
+
+    def set(self, i: int, value):
+        self.codes[i] = self.encode(value)
+
+    def values(self) -> list:
+        cats = self.categories
+        return [None if c < 0 else cats[c] for c in self.codes]
+
+    def nbytes(self) -> int:
+        return (self.codes.itemsize * len(self.codes)
+                + sum(sys.getsizeof(c) for c in self.categories) + sys.getsizeof(self.lookup))
+
+
+class StrColumn:
+    """Mostly-unique strings (names, keys), interned so repeats share storage."""
+
+    __slots__ = ('data',)
+
+    def __init__(self):
+        self.data: list = []
+
+    def append(self, value):
+        self.data.append(sys.intern(value) if isinstance(value, str) else value)
+
+    def get(self, i: int):
+        return self.data[i]
+
+    def set(self, i: int, value):
+        self.data[i] = sys.intern(value) if isinstance(value, str) else value
+
+    def values(self) -> list:
+        return list(self.data)
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data) + sum(sys.getsizeof(v) for v in set(self.data) if v is not None)
+
+
+_COLUMN_TYPES = {INT: IntColumn, FLOAT: FloatColumn, CATEGORY: CategoryColumn, STR: StrColumn}
+
+
+def _kind_of_type(sql_type) -> str | None:
+    # None when the statement does not say (func.avg(...), literals, ...)
+    if isinstance(sql_type, NullType):
+        return None
+    if isinstance(sql_type, (Integer, Boolean)):
+        return INT
+    if isinstance(sql_type, (Float, Numeric)):
+        return FLOAT
+    return STR
+
+
+def _kind_of_values(values) -> str:
+    seen = {type(v) for v in values if v is not None}
+    if seen and seen <= {int, bool}:
+        return INT
+    if seen and seen <= {int, bool, float}:
+        return FLOAT
+    return STR
+
+
+def infer_schema(statement, columns: list, chunk: list) -> dict:
+    """Return a {column: kind} schema for the rows of `statement`.
+
+    Columns found in BIO_SCHEMA or STATS_SCHEMA keep their kind; others
+    take it from the statement's SQL type, or failing that from the Python
+    types in `chunk`.
+    """
+    known = {**STATS_SCHEMA, **BIO_SCHEMA}
+    sql_types = {c.name: c.type for c in getattr(statement, 'selected_columns', ())}
+    schema = {}
+    for i, name in enumerate(columns):
+        kind = known.get(name)
+        if kind is None and name in sql_types:
+            kind = _kind_of_type(sql_types[name])
+        if kind is None:
+            kind = _kind_of_values(row[i] for row in chunk)
+        schema[name] = kind
+    return schema
+
+
+class PlayerRow:
+    """Read-only view of one row of a `PlayerTable`; attributes are column names."""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'PlayerTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        column = self._table.columns.get(name)
+        if column is None:
+            raise AttributeError(name)
+        return column.get(self._index)
+
+    def as_dict(self) -> dict:
+        i = self._index
+        return {name: col.get(i) for name, col in self._table.columns.items()}
+
+    def __repr__(self) -> str:
+        return f'PlayerRow({self.as_dict()!r})'
+
+
+class PlayerTable:
+    """Column store for players described by a {column: kind} schema."""
+
+    def __init__(self, schema: dict):
+        unknown = set(schema.values()) - set(_COLUMN_TYPES)
+        if unknown:
+            raise ValueError(f'Unknown column kind(s): {sorted(unknown)}')
+        self.schema = dict(schema)
+        self.columns = {name: _COLUMN_TYPES[kind]() for name, kind in schema.items()}
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i: int) -> PlayerRow:
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        return PlayerRow(self, i)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield PlayerRow(self, i)
+
+    def append(self, values: dict):
+        """Append one row from a mapping; missing columns are stored as None."""
+        for name, col in self.columns.items():
+            col.append(values.get(name))
+        self._length += 1
+
+    def extend(self, rows):
+        for values in rows:
+            self.append(values)
+
+    def append_tuple(self, names: list, row):
+        """Append one positional row whose fields are named by `names`."""
+        self.append(dict(zip(names, row)))
+
+    def set(self, i: int, name: str, value):
+        self.columns[name].set(i, value)
+
+    def column(self, name: str) -> list:
+        """Return the values of column `name` as a list."""
+        return self.columns[name].values()
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the column buffers."""
+        return sum(col.nbytes() for col in self.columns.values())
+
+    @classmethod
+    def from_rows(cls, schema: dict, rows) -> 'PlayerTable':
+        table = cls(schema)
+        table.extend(rows)
+        return table
+
+    @classmethod
+    def from_models(cls, schema: dict, instances) -> 'PlayerTable':
+        """Build from `Bio`/`Stats` objects (or anything with matching attributes)."""
+        table = cls(schema)
+        names = list(schema)
+        for obj in instances:
+            table.append({name: getattr(obj, name, None) for name in names})
+        return table
+
+    @classmethod
+    def from_bio_csv(cls, csv_path: str | None = None) -> 'PlayerTable':
+        """Load bio.csv with the `bio_instances` conversions, skipping model construction."""
+        return cls.from_rows(BIO_SCHEMA, iter_bio_rows(csv_path))
+
+    @classmethod
+    def from_stats_csv(cls, csv_path: str | None = None) -> 'PlayerTable':
+        """Load stats.csv with the `stats_instances` conversions, skipping model construction."""
+        return cls.from_rows(STATS_SCHEMA, iter_stats_rows(csv_path))
+
+    @classmethod
+    def from_query(cls, statement, schema: dict | None = None, db_engine=None, chunk_size: int = 1000) -> 'PlayerTable':
+        """Stream the rows of `statement` into a table.
+
+        When `schema` is omitted it is worked out by `infer_schema`.
+        """
+        table = None
+        for columns, chunk in stream_rows(statement, chunk_size, db_engine):
+            if table is None:
+                if schema is None:
+                    schema = infer_schema(statement, columns, chunk)
+                table = cls(schema)
+            for row in chunk:
+                table.append_tuple(columns, row)
+        return table if table is not None else cls(schema or {})
+
+
+__all__ = [
+    "PlayerTable",
+    "PlayerRow",
+    "infer_schema",
+    "BIO_SCHEMA",
+    "STATS_SCHEMA",
+    "INT",
+    "FLOAT",
+    "CATEGORY",
+    "STR",
+]
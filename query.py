@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Run a named, prepared query against hockey.db and stream the rows out.
+
+Rows are pulled from the database in chunks with `fetchmany` on a
+streaming cursor and written as they arrive, so memory use stays flat no
+matter how large the result is. Time-to-first-row and totals are reported
+on stderr.
+
+Usage:
+  python3 query.py --list
+  python3 query.py roster --position Forward --format csv
+  python3 query.py stats --min-gp 10 --format jsonl --out stats.jsonl
+  python3 query.py position_weight --min-avg-weight 180
+  python3 query.py roster_stats --format parquet --out roster_stats.parquet
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import nullcontext
+
+from sqlalchemy import Boolean, Connection, Float, Integer, Numeric, func
+from sqlalchemy.types import NullType
+from sqlmodel import select
+
+from models import Bio, Stats, engine
+from names import join_bio_stats
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except Exception:
+    pyarrow = None
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def roster_query(position: str | None = None, class_year: str | None = None):
+    statement = select(*Bio.__table__.columns)
+    if position:
+        statement = statement.where(Bio.position == position)
+    if class_year:
+        statement = statement.where(Bio.class_year == class_year)
+    return statement.order_by(Bio.last_name, Bio.first_name)
+
+
+def stats_query(min_gp: int | None = None):
+    statement = select(*Stats.__table__.columns)
+    if min_gp is not None:
+        statement = statement.where(Stats.GP >= min_gp)
+    return statement.order_by(Stats.last_name, Stats.first_name)
+
+
+def position_weight_query(min_avg_weight: float | None = None):
+    avg_weight = func.avg(Bio.weight, type_=Float)
+    statement = (
+        select(Bio.position, avg_weight.label('avg_weight'), func.count().label('players'))
+        .group_by(Bio.position)
+    )
+    if min_avg_weight is not None:
+        statement = statement.having(avg_weight > min_avg_weight)
+    return statement.order_by(Bio.position)
+
+
+def roster_stats_query(position: str | None = None, min_gp: int | None = None):
+    statement = join_bio_stats(
+        Bio.first_name, Bio.last_name, Bio.position, Bio.class_year,
+        Stats.GP, Stats.G, Stats.A, Stats.PTS, Stats.Plus_Minus,
+    )
+    if position:
+        statement = statement.where(Bio.position == position)
+    if min_gp is not None:
+        statement = statement.where(Stats.GP >= min_gp)
+    return statement.order_by(Bio.last_name, Bio.first_name)
+
+
+# name -> (statement builder, parameters it accepts, description)
+QUERIES = {
+    'roster': (roster_query, ('position', 'class_year'), 'Bio rows, optionally filtered'),
+    'stats': (stats_query, ('min_gp',), 'Stats rows, optionally filtered by games played'),
+    'position_weight': (position_weight_query, ('min_avg_weight',), 'Average weight per position'),
+    'roster_stats': (roster_stats_query, ('position', 'min_gp'), 'Bio joined to Stats'),
+}
+
+
+def build_query(name: str, **params):
+    """Return the prepared statement for query `name` with `params` applied.
+
+    Parameters that the query does not accept, or that are None, are ignored.
+    """
+    if name not in QUERIES:
+        raise KeyError(f'Unknown query: {name}')
+    builder, accepted, _ = QUERIES[name]
+    kwargs = {k: v for k, v in params.items() if k in accepted and v is not None}
+    return builder(**kwargs)
+
+
+def connect(db_engine=None):
+    """Context manager yielding a connection; an already open Connection is used as-is."""
+    db_engine = db_engine or engine
+    if isinstance(db_engine, Connection):
+        return nullcontext(db_engine)
+    return db_engine.connect()
+
+
+def stream_rows(statement, chunk_size: int = DEFAULT_CHUNK_SIZE, db_engine=None):
+    """Yield (columns, chunk) pairs for `statement`, `chunk_size` rows at a time.
+
+    Uses a server-side/streaming cursor so only one chunk is held at once.
+    `db_engine` may also be an open Connection.
+    """
+    with connect(db_engine) as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(statement)
+        columns = list(result.keys())
+        while True:
+            chunk = result.fetchmany(chunk_size)
+            if not chunk:
+                break
+            yield columns, chunk
+
+
+class CsvSink:
+    def __init__(self, fh):
+        self.writer = csv.writer(fh)
+        self.header_written = False
+
+    def write(self, columns: list, chunk: list):
+        if not self.header_written:
+            self.writer.writerow(columns)
+            self.header_written = True
+        self.writer.writerows(chunk)
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    def __init__(self, fh):
+        self.fh = fh
+
+    def write(self, columns: list, chunk: list):
+        for row in chunk:
+            self.fh.write(json.dumps(dict(zip(columns, row)), default=str))
+            self.fh.write('\n')
+
+    def close(self):
+        pass
+
+
+def arrow_schema(statement):
+    """Return a pyarrow schema for the columns `statement` selects.
+
+    Types come from the statement rather than from the data, so a column
+    that is NULL throughout a chunk still gets its real type. Expressions of
+    unknown type are left as null fields for `ParquetSink` to infer.
+    """
+    if pyarrow is None:
+        raise RuntimeError('Parquet output requires pyarrow (pip install pyarrow)')
+    fields = []
+    for column in statement.selected_columns:
+        sql_type = column.type
+        if isinstance(sql_type, NullType):
+            arrow_type = pyarrow.null()
+        elif isinstance(sql_type, Boolean):
+            arrow_type = pyarrow.bool_()
+        elif isinstance(sql_type, Integer):
+            arrow_type = pyarrow.int64()
+        elif isinstance(sql_type, (Float, Numeric)):
+            arrow_type = pyarrow.float64()
+        else:
+            arrow_type = pyarrow.string()
+        fields.append(pyarrow.field(column.name, arrow_type))
+    return pyarrow.schema(fields)
+
+
+class ParquetSink:
+    def __init__(self, path: str, schema=None):
+        if pyarrow is None:
+            raise RuntimeError('Parquet output requires pyarrow (pip install pyarrow)')
+        self.path = path
+        self.schema = schema
+        self.writer = None
+
+    def write(self, columns: list, chunk: list):
+        rows = [dict(zip(columns, row)) for row in chunk]
+        if self.writer is None:
+            self.schema = self._resolve_schema(columns, rows)
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def _resolve_schema(self, columns: list, rows: list):
+        # fields without a known type are inferred from the first chunk; all-NULL ones widen to string
+        known = {} if self.schema is None else {f.name: f for f in self.schema}
+        inferred = pyarrow.Table.from_pylist(rows).schema
+        fields = []
+        for name in columns:
+            field = known.get(name)
+            if field is None or pyarrow.types.is_null(field.type):
+                field = inferred.field(name)
+            if pyarrow.types.is_null(field.type):
+                field = field.with_type(pyarrow.string())
+            fields.append(field)
+        return pyarrow.schema(fields)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def run_query(name: str, sink, chunk_size: int = DEFAULT_CHUNK_SIZE, db_engine=None, **params) -> dict:
+    """Stream query `name` into `sink` and return timing information."""
+    statement = build_query(name, **params)
+    start = time.perf_counter()
+    first_row = None
+    rows = 0
+    for columns, chunk in stream_rows(statement, chunk_size, db_engine):
+        if first_row is None:
+            first_row = time.perf_counter() - start
+        sink.write(columns, chunk)
+        rows += len(chunk)
+    sink.close()
+    return {
+        'query': name,
+        'rows': rows,
+        'time_to_first_row': first_row,
+        'total_seconds': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream a named query from hockey.db')
+    parser.add_argument('query', nargs='?', help='Name of the prepared query to run')
+    parser.add_argument('--list', action='store_true', help='List available queries and exit')
+    parser.add_argument('--format', '-f', choices=('csv', 'jsonl', 'parquet'), default='csv')
+    parser.add_argument('--out', '-o', help='Output path (default: stdout; required for parquet)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows fetched per round trip')
+    parser.add_argument('--position', help='Filter by position (roster, roster_stats)')
+    parser.add_argument('--class-year', help='Filter by class year (roster)')
+    parser.add_argument('--min-gp', type=int, help='Minimum games played (stats, roster_stats)')
+    parser.add_argument('--min-avg-weight', type=float, help='Minimum average weight (position_weight)')
+    args = parser.parse_args()
+
+    if args.list or not args.query:
+        for name, (_, accepted, description) in QUERIES.items():
+            params = ', '.join('--' + p.replace('_', '-') for p in accepted)
+            print(f'{name:<16} {description} [{params}]')
+        return
+
+    if args.query not in QUERIES:
+        print('Unknown query:', args.query, file=sys.stderr)
+        sys.exit(2)
+    if args.format == 'parquet' and not args.out:
+        print('--out is required for parquet output', file=sys.stderr)
+        sys.exit(2)
+
+    params = dict(
+        position=args.position,
+        class_year=args.class_year,
+        min_gp=args.min_gp,
+        min_avg_weight=args.min_avg_weight,
+    )
+
+    fh = None
+    try:
+        if args.format == 'parquet':
+            sink = ParquetSink(args.out, arrow_schema(build_query(args.query, **params)))
+        else:
+            fh = open(args.out, 'w', newline='', encoding='utf-8') if args.out else sys.stdout
+            sink = CsvSink(fh) if args.format == 'csv' else JsonLinesSink(fh)
+        info = run_query(args.query, sink, chunk_size=args.chunk_size, **params)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if fh is not None and fh is not sys.stdout:
+            fh.close()
+
+    ttfr = info['time_to_first_row']
+    ttfr_txt = f'{ttfr * 1000:.1f} ms' if ttfr is not None else 'n/a (no rows)'
+    print(f"{info['rows']} rows in {info['total_seconds']:.3f}s; time to first row {ttfr_txt}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
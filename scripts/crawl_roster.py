@@ -11,6 +11,9 @@ import sys
 import time
 import argparse
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import metrics
+
 try:
     import requests
 except Exception:
@@ -26,17 +29,32 @@ FIELDNAMES = [
 
 
 def fetch_url(url: str) -> str:
-    if requests:
-        r = requests.get(url, timeout=15)
-        r.raise_for_status()
-        return r.text
-    # fallback to urllib
-    from urllib.request import urlopen
-    with urlopen(url, timeout=15) as fh:
-        return fh.read().decode('utf-8', errors='ignore')
+    with metrics.timer('crawl_fetch_seconds'):
+        if requests:
+            r = requests.get(url, timeout=15)
+            r.raise_for_status()
+            text = r.text
+        else:
+            # fallback to urllib
+            from urllib.request import urlopen
+            with urlopen(url, timeout=15) as fh:
+                text = fh.read().decode('utf-8', errors='ignore')
+    metrics.inc('crawl_pages_fetched_total')
+    metrics.inc('crawl_bytes_total', len(text))
+    return text
 
 
 def parse_html(content: str) -> dict:
+    with metrics.timer('parse_seconds', parser='crawl_roster'):
+        data = _parse_html(content)
+    if metrics.enabled():
+        for k, v in data.items():
+            if not v:
+                metrics.inc('parse_fields_missing_total', parser='crawl_roster', field=k)
+    return data
+
+
+def _parse_html(content: str) -> dict:
     data = dict.fromkeys(FIELDNAMES, '')
 
     m = re.search(r'<span class="sidearm-roster-player-name [^>]*>.*?<span>([^<]+)</span>\s*<span>([^<]+)</span>', content, re.S)
@@ -127,6 +145,7 @@ def crawl(roster_url: str, append: bool = True, limit: int | None = None):
                 print('  Skipped: no name parsed')
                 continue
             if key in seen:
+                metrics.inc('crawl_players_already_seen_total')
                 print('  Skipped (exists):', key)
                 continue
             if append:
@@ -138,6 +157,7 @@ def crawl(roster_url: str, append: bool = True, limit: int | None = None):
             added += 1
             time.sleep(0.3)
         except Exception as e:
+            metrics.inc('crawl_errors_total')
             print('  Error fetching/parsing', link, e)
 
     print(f'Done. Added {added} new players.')
@@ -152,7 +172,8 @@ def main():
 
     lim = args.limit if args.limit and args.limit > 0 else None
     try:
-        crawl(args.roster_url, append=args.append, limit=lim)
+        with metrics.profile('crawl_roster'):
+            crawl(args.roster_url, append=args.append, limit=lim)
     except Exception as e:
         print('Fatal error:', e)
         sys.exit(1)
@@ -1,15 +1,46 @@
 #!/usr/bin/env python3
-"""Normalize the Player column in stats.csv: Title-case names and remove duplicated text.
+"""Normalize player names in stats CSVs: Title-case names and remove duplicated text.
 
 Usage:
   python3 scripts/normalize_stats_players.py stats.csv
-This updates the file in-place and preserves other columns.
+  python3 scripts/normalize_stats_players.py --jobs 4 seasons/*.csv
+  python3 scripts/normalize_stats_players.py --column Player raw_stats.csv
+Each file is streamed row by row into a temp file next to it, which then
+atomically replaces the original, so a crash never leaves a half-written
+file. Other columns are preserved.
+
+The name columns are found by header. A combined "Player" column
+('last, first') is used when present; otherwise the separate first_name /
+last_name columns written by populate_stats.py (the layout of the repo's
+stats.csv) are cleaned: quotes, extra whitespace and repeated text are
+removed, and only all-lower or all-upper names are re-cased, so names
+like McDonald or LeBlanc are kept as written. --column names the
+combined column explicitly and turns the fallback off.
 """
+import argparse
 import csv
-import sys
+import os
 import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import metrics
+
+DEFAULT_COLUMN = 'Player'
+# used when the header has no DEFAULT_COLUMN
+NAME_COLUMNS = ('first_name', 'last_name')
+
+
+def _title_case(name: str) -> str:
+    # Title-case each hyphenated/compound piece
+    return '-'.join([p.capitalize() for p in name.split('-')])
 
 
+@lru_cache(maxsize=65536)
 def normalize_player_field(s: str) -> str:
     # s may be like 'bartecko, dominik bartecko, dominik' or 'bartecko, dominik'
     s = s.strip()
@@ -27,11 +58,8 @@ def normalize_player_field(s: str) -> str:
         # rest may contain duplicated portion; keep first token sequence
         first = rest.strip().split()[0] if rest.strip() else ''
         last = last.strip()
-        # Title-case each hyphenated/compound piece
-        def tcase(name):
-            return '-'.join([p.capitalize() for p in name.split('-')])
-        last = ' '.join([tcase(p) for p in last.split()])
-        first = ' '.join([tcase(p) for p in first.split()])
+        last = ' '.join([_title_case(p) for p in last.split()])
+        first = ' '.join([_title_case(p) for p in first.split()])
         out = f'{last}, {first}' if first else f'{last}'
         return out
     # fallback: title case whole
@@ -39,31 +67,134 @@ def normalize_player_field(s: str) -> str:
     return s2
 
 
+@lru_cache(maxsize=65536)
+def normalize_name_part(s: str) -> str:
+    # a single first or last name, e.g. ' de-luca ' -> 'De-Luca', 'Bartecko Bartecko' -> 'Bartecko'
+    s = s.strip()
+    if s.startswith('"') and s.endswith('"'):
+        s = s[1:-1]
+    words = s.split()
+    half = len(words) // 2
+    if half and len(words) % 2 == 0 and words[:half] == words[half:]:
+        words = words[:half]
+    s = ' '.join(words)
+    if not (s.islower() or s.isupper()):
+        # mixed case is taken as written: McDonald, LeBlanc, Van der Berg
+        return s
+    return ' '.join(["'".join([_title_case(p) for p in w.split("'")]) for w in words])
+
+
+def find_column(header: list, column: str) -> int | None:
+    want = column.strip().lower()
+    for i, name in enumerate(header):
+        if name.strip().lower() == want:
+            return i
+    return None
+
+
+def name_columns(header: list, column: str | None = None) -> list:
+    """Return [(index, normalizer), ...] for the name columns in `header`.
+
+    With `column` None, DEFAULT_COLUMN is used if present, else the
+    NAME_COLUMNS pair. Raises ValueError when nothing matches.
+    """
+    idx = find_column(header, column or DEFAULT_COLUMN)
+    if idx is not None:
+        return [(idx, normalize_player_field)]
+    if column is not None:
+        raise ValueError(f'no {column!r} column in header')
+    found = [find_column(header, name) for name in NAME_COLUMNS]
+    if None in found:
+        raise ValueError(f'no {DEFAULT_COLUMN!r} or {"/".join(NAME_COLUMNS)} columns in header')
+    return [(i, normalize_name_part) for i in found]
+
+
+def normalize_file(path: str, column: str | None = None) -> dict:
+    """Normalize the name column(s) in the CSV at `path` and atomically replace the file.
+
+    `column` is as for `name_columns`. Returns a summary dict with the row
+    count, elapsed seconds and an error message (None on success). The
+    original file is untouched on failure.
+    """
+    start = time.perf_counter()
+    rows = 0
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.normalize-', suffix='.csv', dir=directory)
+    try:
+        with open(path, newline='', encoding='utf-8') as src, \
+                os.fdopen(fd, 'w', newline='', encoding='utf-8') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError('empty file')
+            targets = name_columns(header, column)
+            writer.writerow(header)
+            for r in reader:
+                for idx, normalize in targets:
+                    if len(r) > idx:
+                        r[idx] = normalize(r[idx])
+                writer.writerow(r)
+                rows += 1
+            dst.flush()
+            os.fsync(dst.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except OSError:
+            pass
+        os.replace(tmp_path, path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return {'path': path, 'rows': rows, 'seconds': time.perf_counter() - start, 'error': str(e)}
+    return {'path': path, 'rows': rows, 'seconds': time.perf_counter() - start, 'error': None}
+
+
+def _normalize_file_job(job: tuple) -> dict:
+    return normalize_file(*job)
+
+
+def normalize_files(paths: list, column: str | None = None, jobs: int = 1) -> list:
+    """Normalize every file in `paths`, across `jobs` worker processes when > 1."""
+    work = [(p, column) for p in paths]
+    if jobs <= 1 or len(paths) <= 1:
+        return [normalize_file(p, column) for p in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_normalize_file_job, work))
+
+
 def main():
-    if len(sys.argv) < 2:
-        print('Usage: normalize_stats_players.py <stats.csv>')
+    parser = argparse.ArgumentParser(description='Normalize the player column of one or more stats CSVs in place')
+    parser.add_argument('paths', nargs='+', help='CSV files to normalize')
+    parser.add_argument('--column', '-c',
+                        help=f'Header name of a combined player column (default: {DEFAULT_COLUMN!r}, '
+                             f'else {"/".join(NAME_COLUMNS)})')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes (default 1)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with metrics.profile('normalize_stats_players'):
+        results = normalize_files(args.paths, column=args.column, jobs=args.jobs)
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    total_rows = 0
+    for res in results:
+        metrics.observe('normalize_file_seconds', res['seconds'])
+        if res['error']:
+            failed += 1
+            metrics.inc('normalize_files_failed_total')
+            print(f"Failed {res['path']}: {res['error']}", file=sys.stderr)
+            continue
+        total_rows += res['rows']
+        metrics.inc('normalize_rows_total', res['rows'])
+        rate = res['rows'] / res['seconds'] if res['seconds'] > 0 else 0.0
+        print(f"Normalized player names in {res['path']} ({res['rows']} rows, {rate:,.0f} rows/sec)")
+
+    overall = total_rows / elapsed if elapsed > 0 else 0.0
+    print(f'Done. {len(results) - failed} files, {total_rows} rows in {elapsed:.2f}s ({overall:,.0f} rows/sec)')
+    if failed:
         sys.exit(1)
-    path = sys.argv[1]
-    rows = []
-    with open(path, newline='', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        for r in reader:
-            rows.append(r)
-
-    if not rows:
-        print('Empty file')
-        return
-
-    # normalize player column (assumed index 1)
-    for i in range(1, len(rows)):
-        if len(rows[i]) > 1:
-            rows[i][1] = normalize_player_field(rows[i][1])
-
-    with open(path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerows(rows)
-
-    print('Normalized Player column in', path)
 
 
 if __name__ == '__main__':
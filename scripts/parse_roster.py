@@ -5,6 +5,9 @@ import argparse
 import os
 import sys
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import metrics
+
 CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'bio.csv')
 CSV_PATH = os.path.abspath(CSV_PATH)
 
@@ -13,6 +16,16 @@ FIELDNAMES = [
 ]
 
 def parse_html(content: str) -> dict:
+    with metrics.timer('parse_seconds', parser='parse_roster'):
+        data = _parse_html(content)
+    if metrics.enabled():
+        for k, v in data.items():
+            if not v:
+                metrics.inc('parse_fields_missing_total', parser='parse_roster', field=k)
+    return data
+
+
+def _parse_html(content: str) -> dict:
     data = dict.fromkeys(FIELDNAMES, '')
 
     # name
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Run the crawl -> parse -> normalize -> load pipeline as a DAG of stages.
+
+Each stage declares the files it reads and writes, and load stages the
+hockey.db tables they fill. A stage is skipped when the content hashes of
+its inputs, outputs and tables match its last successful run,
+independent branches (the bio side and the stats side) run in parallel, and
+per-stage timings are recorded in .pipeline_state.json at the repository
+root. Network stages always run unless --no-fetch is given; when they
+produce identical files, everything downstream is skipped.
+
+Usage:
+  python3 scripts/pipeline.py
+  python3 scripts/pipeline.py --no-fetch
+  python3 scripts/pipeline.py --retry        # re-run only failed/blocked stages
+  python3 scripts/pipeline.py --force --only init_stats
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STATE_PATH = os.path.join(ROOT, '.pipeline_state.json')
+DB_PATH = os.path.join(ROOT, 'hockey.db')
+
+
+@dataclass
+class Stage:
+    name: str
+    cmd: list
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    deps: list = field(default_factory=list)
+    # hockey.db tables the stage loads, checked like outputs
+    tables: list = field(default_factory=list)
+    # stages that read from the network cannot be skipped on input hashes
+    fetch: bool = False
+
+
+def _py(*args) -> list:
+    return [sys.executable, *args]
+
+
+# hockey.db is written by both load stages, so it is not declared as a file
+# output (each would invalidate the other); each declares its own tables instead.
+STAGES = [
+    Stage('crawl_roster', _py('scripts/crawl_roster.py', '--append'),
+          inputs=['scripts/crawl_roster.py'], outputs=['bio.csv'], fetch=True),
+    Stage('populate_stats', _py('scripts/populate_stats.py', '--raw'),
+          inputs=['scripts/populate_stats.py'], outputs=['stats.csv'], fetch=True),
+    # populate_stats keeps stats.csv's first_name/last_name header (what init_stats
+    # reads), so no --column: normalize falls back to those columns when there is no Player
+    Stage('normalize_stats_players', _py('scripts/normalize_stats_players.py', 'stats.csv'),
+          inputs=['scripts/normalize_stats_players.py', 'stats.csv'], outputs=['stats.csv'],
+          deps=['populate_stats']),
+    Stage('init_bio', _py('init_bio.py'),
+          inputs=['init_bio.py', 'bio_instances.py', 'models.py', 'names.py', 'bio.csv'],
+          deps=['crawl_roster'], tables=['bio']),
+    # alias resolution in init_stats needs the Bio rows loaded first
+    Stage('init_stats', _py('init_stats.py'),
+          inputs=['init_stats.py', 'stats_instances.py', 'models.py', 'names.py', 'stats.csv'],
+          deps=['normalize_stats_players', 'init_bio'], tables=['stats', 'namealias']),
+]
+
+
+def file_hash(rel_path: str) -> str | None:
+    path = os.path.join(ROOT, rel_path)
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hashes(paths: list) -> dict:
+    return {p: file_hash(p) for p in paths}
+
+
+def table_fingerprint(table: str, db_path: str | None = None) -> str | None:
+    """Return '<row count>:<content hash>' for `table`, or None if it or the database is missing."""
+    db_path = db_path or DB_PATH
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        rows = conn.execute(f'SELECT * FROM "{table}"').fetchall()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    h = hashlib.sha256()
+    for row in sorted(repr(r) for r in rows):
+        h.update(row.encode('utf-8'))
+        h.update(b'\n')
+    return f'{len(rows)}:{h.hexdigest()}'
+
+
+def table_fingerprints(tables: list, db_path: str | None = None) -> dict:
+    return {t: table_fingerprint(t, db_path) for t in tables}
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def save_state(state: dict, path: str = STATE_PATH):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(state, fh, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def validate(stages: list):
+    names = {s.name for s in stages}
+    for s in stages:
+        for d in s.deps:
+            if d not in names:
+                raise ValueError(f'Stage {s.name} depends on unknown stage {d}')
+    # detect cycles with a DFS
+    graph = {s.name: s.deps for s in stages}
+    visiting, done = set(), set()
+
+    def visit(n):
+        if n in done:
+            return
+        if n in visiting:
+            raise ValueError(f'Dependency cycle through stage {n}')
+        visiting.add(n)
+        for d in graph[n]:
+            visit(d)
+        visiting.discard(n)
+        done.add(n)
+
+    for n in graph:
+        visit(n)
+
+
+def is_up_to_date(stage: Stage, record: dict | None) -> bool:
+    if stage.fetch or not record or record.get('status') != 'ok':
+        return False
+    return (record.get('inputs') == hashes(stage.inputs)
+            and record.get('outputs') == hashes(stage.outputs)
+            and record.get('tables', {}) == table_fingerprints(stage.tables))
+
+
+def run_stage(stage: Stage) -> dict:
+    input_hashes = hashes(stage.inputs)
+    start = time.perf_counter()
+    proc = subprocess.run(stage.cmd, cwd=ROOT, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    output_hashes = hashes(stage.outputs)
+    table_hashes = table_fingerprints(stage.tables)
+    # a file rewritten in place is up to date once it holds what we wrote
+    input_hashes.update({p: h for p, h in output_hashes.items() if p in input_hashes})
+    return {
+        'status': 'ok' if proc.returncode == 0 else 'failed',
+        'returncode': proc.returncode,
+        'seconds': round(seconds, 3),
+        'inputs': input_hashes,
+        'outputs': output_hashes,
+        'tables': table_hashes,
+        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'stdout': proc.stdout,
+        'stderr': proc.stderr,
+    }
+
+
+def run_pipeline(stages: list = STAGES, jobs: int = 2, retry: bool = False, force: bool = False,
+                 no_fetch: bool = False, only: list | None = None, state_path: str = STATE_PATH) -> dict:
+    """Run `stages` respecting dependencies and return {name: status}.
+
+    With `retry`, only stages whose last status was failed/blocked are run;
+    everything else counts as satisfied. With `only`, stages outside the list
+    are treated the same way.
+    """
+    validate(stages)
+    state = load_state(state_path)
+    records = state.setdefault('stages', {})
+    by_name = {s.name: s for s in stages}
+
+    status = {}
+    for s in stages:
+        prev = records.get(s.name, {}).get('status')
+        if retry and prev not in ('failed', 'blocked'):
+            status[s.name] = 'skipped'
+        elif only and s.name not in only:
+            status[s.name] = 'skipped'
+        elif s.fetch and no_fetch:
+            status[s.name] = 'skipped'
+    pending = [s.name for s in stages if s.name not in status]
+
+    run_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                stage = by_name[name]
+                dep_status = [status.get(d) for d in stage.deps]
+                if any(st in ('failed', 'blocked') for st in dep_status):
+                    status[name] = 'blocked'
+                    records[name] = {**records.get(name, {}), 'status': 'blocked'}
+                    print(f'[{name}] blocked by failed dependency')
+                    pending.remove(name)
+                    continue
+                if any(st is None for st in dep_status):
+                    continue
+                pending.remove(name)
+                if not force and is_up_to_date(stage, records.get(name)):
+                    status[name] = 'skipped'
+                    print(f'[{name}] up to date, skipped')
+                    continue
+                print(f'[{name}] running')
+                running[pool.submit(run_stage, stage)] = name
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                result = fut.result()
+                for stream in ('stdout', 'stderr'):
+                    for line in result.pop(stream).splitlines():
+                        print(f'[{name}] {line}')
+                status[name] = result['status']
+                records[name] = result
+                print(f"[{name}] {result['status']} in {result['seconds']:.2f}s")
+                save_state(state, state_path)
+
+    state['last_run'] = {
+        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seconds': round(time.perf_counter() - run_start, 3),
+        'status': status,
+    }
+    save_state(state, state_path)
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the ingest pipeline, skipping stages whose inputs are unchanged')
+    parser.add_argument('--jobs', '-j', type=int, default=2, help='Stages to run in parallel')
+    parser.add_argument('--retry', action='store_true', help='Only re-run stages that failed or were blocked last time')
+    parser.add_argument('--force', action='store_true', help='Ignore content hashes and run every selected stage')
+    parser.add_argument('--no-fetch', action='store_true', help='Do not run network stages; use files on disk')
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help='Run only these stages')
+    parser.add_argument('--list', action='store_true', help='List stages with their last timings and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        records = load_state().get('stages', {})
+        for s in STAGES:
+            rec = records.get(s.name, {})
+            timing = f"{rec['seconds']:.2f}s" if 'seconds' in rec else '-'
+            deps = ', '.join(s.deps) or '-'
+            print(f"{s.name:<24} {rec.get('status', 'never run'):<10} {timing:>9}  deps: {deps}")
+        return
+
+    if args.only:
+        unknown = set(args.only) - {s.name for s in STAGES}
+        if unknown:
+            print('Unknown stage(s):', ', '.join(sorted(unknown)), file=sys.stderr)
+            sys.exit(2)
+
+    status = run_pipeline(jobs=args.jobs, retry=args.retry, force=args.force,
+                          no_fetch=args.no_fetch, only=args.only)
+    failed = [n for n, st in status.items() if st in ('failed', 'blocked')]
+    if failed:
+        print('Failed or blocked:', ', '.join(failed), '(re-run with --retry)', file=sys.stderr)
+        sys.exit(1)
+    print('Pipeline complete.')
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,9 @@ import sys
 import csv
 import argparse
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import metrics
+
 try:
     import requests
 except Exception:
@@ -26,13 +29,18 @@ DEFAULT_OUT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sta
 
 
 def fetch(url: str) -> str:
-    if requests:
-        r = requests.get(url, timeout=20)
-        r.raise_for_status()
-        return r.text
-    from urllib.request import urlopen
-    with urlopen(url, timeout=20) as fh:
-        return fh.read().decode('utf-8', errors='ignore')
+    with metrics.timer('crawl_fetch_seconds'):
+        if requests:
+            r = requests.get(url, timeout=20)
+            r.raise_for_status()
+            text = r.text
+        else:
+            from urllib.request import urlopen
+            with urlopen(url, timeout=20) as fh:
+                text = fh.read().decode('utf-8', errors='ignore')
+    metrics.inc('crawl_pages_fetched_total')
+    metrics.inc('crawl_bytes_total', len(text))
+    return text
 
 
 def extract_table_for_phrase(html: str, phrase: str) -> str | None:
@@ -136,7 +144,8 @@ def main():
         print('Failed to load page/input:', e, file=sys.stderr)
         sys.exit(2)
 
-    table = extract_table_for_phrase(html, args.phrase)
+    with metrics.timer('parse_seconds', parser='populate_stats'):
+        table = extract_table_for_phrase(html, args.phrase)
     if not table:
         print('Could not find target table for phrase:', args.phrase, file=sys.stderr)
         sys.exit(3)
@@ -179,7 +188,9 @@ def main():
             headers = [re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', h)).strip() for h in headers]
 
     # Extract rows
-    rows = extract_body_rows(table)
+    with metrics.profile('populate_stats'), metrics.timer('parse_rows_seconds', parser='populate_stats'):
+        rows = extract_body_rows(table)
+    metrics.inc('parse_rows_total', len(rows), parser='populate_stats')
     if not rows:
         print('No data rows found in table', file=sys.stderr)
         sys.exit(5)
@@ -1,9 +1,17 @@
-from typing import List
+from typing import Iterator, List
 import csv
 import os
 import re
+import time
 
+import metrics
 from models import Stats
+from names import name_key
+
+_NUMERIC_COLUMNS = (
+    'jersey_number', 'G', 'GP', 'A', 'PTS', 'SH', 'SH_PCT', 'Plus_Minus', 'PPG', 'SHG', 'FG', 'GWG',
+    'GTG', 'OTG', 'HTG', 'UAG', 'MIN', 'MAJ', 'OTH', 'BLK',
+)
 
 
 def _to_int(v: str):
@@ -40,27 +48,27 @@ def _to_float(v: str):
         return None
 
 
-def load_stats_instances(csv_path: str | None = None) -> List[Stats]:
-    """Load Stats instances from a CSV file and return a list of `Stats` objects.
+def iter_stats_rows(csv_path: str | None = None) -> Iterator[dict]:
+    """Yield one dict of converted `Stats` field values per CSV row.
 
-    By default reads `stats.csv` in the repository root. Non-parsable numeric
-    fields are converted to None. The header may contain hyphens which are
-    mapped to underscores for attribute lookup (e.g. PN-PIM -> PN_PIM).
+    Conversion matches `load_stats_instances` but no model objects are built,
+    which is what bulk consumers such as `PlayerTable` want.
     """
     if csv_path is None:
         csv_path = os.path.join(os.path.dirname(__file__), '..', 'stats.csv')
 
-    instances: List[Stats] = []
     with open(csv_path, newline='', encoding='utf-8') as fh:
         reader = csv.DictReader(fh)
         for row in reader:
             # normalize header keys: replace '-' with '_'
             r = {k.replace('-', '_'): v for k, v in row.items()}
 
-            s = Stats(
+            first_name = (r.get('first_name') or '').strip() or None
+            last_name = (r.get('last_name') or '').strip() or None
+            values = dict(
                 jersey_number=_to_int(r.get('jersey_number')),
-                first_name=(r.get('first_name') or '').strip() or None,
-                last_name=(r.get('last_name') or '').strip() or None,
+                first_name=first_name,
+                last_name=last_name,
                 G=_to_int(r.get('G')),
                 GP=_to_int(r.get('GP')),
                 A=_to_int(r.get('A')),
@@ -81,9 +89,29 @@ def load_stats_instances(csv_path: str | None = None) -> List[Stats]:
                 MAJ=_to_int(r.get('MAJ')),
                 OTH=_to_int(r.get('OTH')),
                 BLK=_to_int(r.get('BLK')),
+                name_key=name_key(first_name, last_name),
             )
-            instances.append(s)
+            if metrics.enabled():
+                for col in _NUMERIC_COLUMNS:
+                    if values[col] is None and (r.get(col) or '').strip():
+                        metrics.inc('load_conversion_failures_total', loader='stats', column=col)
+            yield values
+
+
+def load_stats_instances(csv_path: str | None = None) -> List[Stats]:
+    """Load Stats instances from a CSV file and return a list of `Stats` objects.
+
+    By default reads `stats.csv` in the repository root. Non-parsable numeric
+    fields are converted to None. The header may contain hyphens which are
+    mapped to underscores for attribute lookup (e.g. PN-PIM -> PN_PIM).
+    `name_key` is computed here so joins against Bio never normalize at
+    query time.
+    """
+    start = time.perf_counter()
+    instances: List[Stats] = [Stats(**values) for values in iter_stats_rows(csv_path)]
 
+    metrics.observe('load_seconds', time.perf_counter() - start, loader='stats')
+    metrics.inc('load_rows_total', len(instances), loader='stats')
     return instances
 
 
@@ -92,4 +120,4 @@ def get_stats_instances() -> List[Stats]:
     return load_stats_instances()
 
 
-__all__ = ["load_stats_instances", "get_stats_instances"]
+__all__ = ["iter_stats_rows", "load_stats_instances", "get_stats_instances"]
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# the modules under test live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """An empty SQLite database with every model table created."""
+    from sqlmodel import SQLModel, create_engine
+
+    engine = create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    SQLModel.metadata.create_all(engine)
+    return engine
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+from sqlmodel import Session, select
+
+from gamelog import ROLLING_STATS, ingest_games, number_games, parse_game_date, parse_game_log, player_trend
+from models import GameLog
+
+
+@pytest.mark.parametrize('raw, season, expected', [
+    ('2025-10-03', None, '2025-10-03'),
+    ('10/03/2025', None, '2025-10-03'),
+    ('Fri, Oct 3', 2025, '2025-10-03'),
+    ('Oct 3 (DH)', 2025, '2025-10-03'),
+    ('Jan 4', 2025, '2026-01-04'),
+    ('Feb 29', 2027, '2028-02-29'),
+    ('2/29', 2023, '2024-02-29'),
+    ('Feb 29', 2026, None),
+    ('Oct 3', None, None),
+    ('Totals', 2025, None),
+])
+def test_parse_game_date(raw, season, expected):
+    assert parse_game_date(raw, season) == expected
+
+
+HTML = '''
+<h2>Game Log</h2>
+<table>
+  <thead><tr><th>Date</th><th>Opponent</th><th>G</th><th>A</th><th>SH</th><th>+/-</th><th>PN-PIM</th><th>BLK</th></tr></thead>
+  <tbody>
+    <tr><td>Jan 9</td><td>Mercyhurst</td><td>1</td><td>0</td><td>3</td><td>1</td><td>1-2</td><td>0</td></tr>
+    <tr><td>Oct 3</td><td>Canisius</td><td>0</td><td>1</td><td>2</td><td>-1</td><td>0-0</td><td>2</td></tr>
+    <tr><td>Jan 9</td><td>Mercyhurst</td><td>2</td><td>1</td><td>5</td><td>2</td><td>-</td><td>1</td></tr>
+    <tr><td>Totals</td><td></td><td>3</td><td>2</td><td>10</td><td>2</td><td>1-2</td><td>3</td></tr>
+  </tbody>
+</table>
+'''
+
+
+def test_parse_game_log_orders_and_numbers_doubleheaders():
+    games = parse_game_log(HTML, season_start_year=2025)
+    assert [(g['game_date'], g['game_no'], g['G']) for g in games] == [
+        ('2025-10-03', 1, 0),
+        ('2026-01-09', 1, 1),
+        ('2026-01-09', 2, 2),
+    ]
+    assert games[0]['PTS'] == 1 and games[0]['PIM'] == 0
+    assert games[1]['PIM'] == 2 and games[2]['PIM'] is None
+
+
+def _game(date, **stats):
+    return {'game_date': date, 'opponent': 'Mercyhurst', **{s: stats.get(s, 0) for s in ROLLING_STATS}}
+
+
+def _expected(games, window):
+    # brute force over every stored game
+    values = [[g[s] or 0 for s in ROLLING_STATS] for g in games]
+    totals = {s: sum(v[i] for v in values) for i, s in enumerate(ROLLING_STATS)}
+    rolling = {s: sum(v[i] for v in values[-window:]) for i, s in enumerate(ROLLING_STATS)}
+    return totals, rolling
+
+
+def test_doubleheader_second_game_is_ingested(db_engine):
+    first = _game('2026-01-09', G=1, PTS=1)
+    second = _game('2026-01-09', G=2, PTS=2)
+    with Session(db_engine) as session:
+        assert ingest_games(session, 'Dominik', 'Bartecko', [first]) == 1
+        session.commit()
+        assert ingest_games(session, 'Dominik', 'Bartecko', [first, second]) == 1
+        session.commit()
+        assert ingest_games(session, 'Dominik', 'Bartecko', [first, second]) == 0
+        ids = session.exec(select(GameLog.game_id).order_by(GameLog.seq)).all()
+        trend = player_trend(session, 'Dominik', 'Bartecko')
+    assert ids == ['2026-01-09|1|Mercyhurst', '2026-01-09|2|Mercyhurst']
+    assert trend['totals']['G'] == 3 and trend['games'] == 2
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_ingest_matches_recomputation(db_engine, seed):
+    rng = random.Random(seed)
+    games = []
+    for day in range(1, 29):
+        for _ in range(rng.choice([1, 1, 1, 2])):
+            games.append(_game(f'2026-02-{day:02d}', **{s: rng.choice([None, rng.randint(-2, 4)]) for s in ROLLING_STATS}))
+    games = number_games(games)
+
+    window = 5
+    cut = 0
+    with Session(db_engine) as session:
+        while cut < len(games):
+            cut = min(len(games), cut + rng.randint(1, 6))
+            if rng.random() < 0.3:
+                window = rng.randint(1, 8)
+            # each pull re-sends the whole log so far, as a refetched page would
+            ingest_games(session, 'Dominik', 'Bartecko', games[:cut], window=window)
+            session.commit()
+            trend = player_trend(session, 'Dominik', 'Bartecko')
+            totals, rolling = _expected(games[:cut], window)
+            assert trend['games'] == cut
+            assert trend['totals'] == totals
+            assert trend['rolling'] == rolling
+            assert trend['last_game_date'] == games[cut - 1]['game_date']
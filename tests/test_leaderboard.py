@@ -0,0 +1,158 @@
+import random
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine, select
+
+import leaderboard
+from leaderboard import LeaderboardCache, top, track, untrack
+from models import Stats
+
+PLAYERS = 40
+
+
+def _engine(tmp_path, name):
+    db_engine = create_engine(f'sqlite:///{tmp_path / name}')
+    SQLModel.metadata.create_all(db_engine)
+    return db_engine
+
+
+def _random_stats(rng, i):
+    gp = rng.randint(0, 30)
+    sh = rng.randint(0, 80)
+    goals = rng.randint(0, 20)
+    return dict(
+        # a missing jersey number marks a non-player row such as team totals
+        first_name=f'First{i}', last_name=f'Last{i % 7}', jersey_number=rng.choice([None, i, i, i, i]), GP=gp, G=goals,
+        A=rng.randint(0, 20), PTS=rng.choice([None, rng.randint(0, 40)]), SH=sh,
+        SH_PCT=round(goals / sh, 3) if sh else None, Plus_Minus=rng.randint(-15, 15), BLK=rng.randint(0, 30),
+    )
+
+
+def _seed(db_engine, rng):
+    with Session(db_engine) as session:
+        for i in range(PLAYERS):
+            session.add(Stats(**_random_stats(rng, i)))
+        session.commit()
+
+
+def _expected(cache, db_engine):
+    return top(cache.stat, cache.n, cache.bottom, cache.min_shots, cache.min_gp, db_engine=db_engine)
+
+
+@pytest.fixture
+def caches():
+    tracked = []
+    yield tracked
+    for cache in tracked:
+        untrack(cache)
+
+
+def _track(caches, *args, **kwargs):
+    cache = track(LeaderboardCache(*args, **kwargs))
+    caches.append(cache)
+    return cache
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_updates_match_top(tmp_path, caches, seed):
+    rng = random.Random(seed)
+    db_engine = _engine(tmp_path, 'stats.db')
+    other_engine = _engine(tmp_path, 'other.db')
+    _seed(db_engine, rng)
+    _seed(other_engine, rng)
+    watched = [
+        _track(caches, 'PTS', n=5, slack=2, db_engine=db_engine),
+        _track(caches, 'SH_PCT', n=4, slack=1, min_shots=20, db_engine=db_engine),
+        _track(caches, 'Plus_Minus', n=5, bottom=True, slack=0, db_engine=db_engine),
+        _track(caches, 'PTS_PER_GP', n=3, slack=3, min_gp=5, db_engine=db_engine),
+    ]
+    next_id = PLAYERS
+
+    for _ in range(150):
+        target = other_engine if rng.random() < 0.2 else db_engine
+        with Session(target) as session:
+            for _ in range(rng.randint(1, 4)):
+                roll = rng.random()
+                rows = session.exec(select(Stats)).all()
+                if roll < 0.6 and rows:
+                    row = rng.choice(rows)
+                    for field, value in _random_stats(rng, 0).items():
+                        if field not in ('first_name', 'last_name') and rng.random() < 0.5:
+                            setattr(row, field, value)
+                elif roll < 0.8 and rows:
+                    session.delete(rng.choice(rows))
+                else:
+                    session.add(Stats(**_random_stats(rng, next_id)))
+                    next_id += 1
+                if rng.random() < 0.5:
+                    session.flush()
+            if rng.random() < 0.3:
+                session.rollback()
+            else:
+                session.commit()
+        for cache in watched:
+            assert cache.leaders() == _expected(cache, db_engine)
+
+
+def test_rollback_after_flush_is_discarded(tmp_path, caches):
+    db_engine = _engine(tmp_path, 'stats.db')
+    _seed(db_engine, random.Random(0))
+    cache = _track(caches, 'PTS', n=3, db_engine=db_engine)
+    before = cache.leaders()
+
+    with Session(db_engine) as session:
+        row = session.get(Stats, ('First1', 'Last1'))
+        row.PTS = 999
+        session.flush()
+        session.rollback()
+    assert cache.leaders() == before == _expected(cache, db_engine)
+
+    # closing without commit rolls back as well
+    with Session(db_engine) as session:
+        session.get(Stats, ('First1', 'Last1')).PTS = 999
+        session.flush()
+    assert cache.leaders() == before
+
+
+def test_savepoint_rollback_refills(tmp_path, caches):
+    db_engine = _engine(tmp_path, 'stats.db')
+    _seed(db_engine, random.Random(1))
+    cache = _track(caches, 'PTS', n=3, db_engine=db_engine)
+
+    with Session(db_engine) as session:
+        session.get(Stats, ('First2', 'Last2')).PTS = 500
+        with session.begin_nested() as savepoint:
+            session.get(Stats, ('First3', 'Last3')).PTS = 999
+            session.flush()
+            savepoint.rollback()
+        session.commit()
+    assert cache.leaders() == _expected(cache, db_engine)
+    assert cache.leaders()[0]['value'] == 500
+
+
+def test_other_engine_is_ignored(tmp_path, caches):
+    db_engine = _engine(tmp_path, 'stats.db')
+    other_engine = _engine(tmp_path, 'other.db')
+    _seed(db_engine, random.Random(2))
+    _seed(other_engine, random.Random(2))
+    cache = _track(caches, 'PTS', n=3, db_engine=db_engine)
+    before = cache.leaders()
+
+    with Session(other_engine) as session:
+        session.get(Stats, ('First1', 'Last1')).PTS = 999
+        session.commit()
+    assert cache.leaders() == before == _expected(cache, db_engine)
+    assert leaderboard.top('PTS', 1, db_engine=other_engine)[0]['value'] == 999
+
+
+def test_team_totals_row_is_excluded(tmp_path, caches):
+    db_engine = _engine(tmp_path, 'stats.db')
+    _seed(db_engine, random.Random(3))
+    cache = _track(caches, 'PTS', n=3, db_engine=db_engine)
+    with Session(db_engine) as session:
+        session.add(Stats(first_name='Team', last_name='Team', jersey_number=None, GP=31, PTS=500, SH=900))
+        session.commit()
+    for stat in ('PTS', 'PTS_PER_GP'):
+        assert all(r['first_name'] != 'Team' for r in top(stat, 50, db_engine=db_engine))
+    assert cache.leaders() == _expected(cache, db_engine)
+    assert all(r['first_name'] != 'Team' for r in cache.leaders())
@@ -0,0 +1,39 @@
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from models import Stats, sync_rows
+
+
+def _rows(db_engine):
+    with Session(db_engine) as session:
+        return sorted((s.first_name, s.last_name, s.PTS) for s in session.exec(select(Stats)))
+
+
+def test_sync_rows_upserts_and_deletes(db_engine):
+    with Session(db_engine) as session:
+        assert sync_rows(session, Stats, [Stats(first_name='A', last_name='B', PTS=1),
+                                          Stats(first_name='C', last_name='D', PTS=2)]) == 0
+        session.commit()
+    with Session(db_engine) as session:
+        assert sync_rows(session, Stats, [Stats(first_name='A', last_name='B', PTS=5),
+                                          Stats(first_name='E', last_name='F', PTS=3)]) == 1
+        session.commit()
+    assert _rows(db_engine) == [('A', 'B', 5), ('E', 'F', 3)]
+
+
+def test_sync_rows_same_data_writes_nothing(db_engine):
+    with Session(db_engine) as session:
+        sync_rows(session, Stats, [Stats(first_name='A', last_name='B', PTS=1, SH_PCT=0.125)])
+        session.commit()
+
+    writes = []
+
+    def record(conn, cursor, statement, *args):
+        if not statement.lstrip().upper().startswith('SELECT'):
+            writes.append(statement)
+
+    event.listen(db_engine, 'before_cursor_execute', record)
+    with Session(db_engine) as session:
+        sync_rows(session, Stats, [Stats(first_name='A', last_name='B', PTS=1, SH_PCT=0.125)])
+        session.commit()
+    assert writes == []
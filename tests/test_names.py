@@ -0,0 +1,75 @@
+import pytest
+from sqlmodel import Session, select
+
+from models import Bio, NameAlias, Stats
+from names import backfill_name_keys, join_bio_stats, name_key, resolve_aliases
+
+
+@pytest.mark.parametrize('a, b', [
+    (('Jacob', 'LeBlanc'), ('Jacob', 'Leblanc')),
+    (('José', 'Núñez'), ('Jose', 'Nunez')),
+    (('Anna-Maria', 'Smith-Jones'), ('Anna Maria', 'Smith  Jones')),
+    (('Liam', "O'Brien"), ('liam', 'OBRIEN')),
+    (('  Ty ', 'St. John'), ('Ty', 'St John')),
+])
+def test_name_key_equates_spelling_variants(a, b):
+    assert name_key(*a) == name_key(*b)
+
+
+def test_name_key_format():
+    assert name_key('Jacob', 'LeBlanc') == 'leblanc|jacob'
+    assert name_key('Zoë', None) == '|zoe'
+    assert name_key(None, '') is None
+    assert name_key('Jacob', 'LeBlanc') != name_key('Jacob', 'LeBlond')
+
+
+def _load(db_engine, bios, stats):
+    with Session(db_engine) as session:
+        for first, last in bios:
+            session.add(Bio(first_name=first, last_name=last, position='Forward'))
+        for first, last in stats:
+            session.add(Stats(first_name=first, last_name=last, GP=10))
+        session.commit()
+        backfill_name_keys(session)
+
+
+BIOS = [('Jacob', 'LeBlanc'), ('Matthew', 'Smith'), ('Nicholas', 'DeAngelo'), ('Ryan', 'MacDonald')]
+STATS = [('Jacob', 'Leblanc'), ('Matt', 'Smith'), ('Nick', 'Deangelo'), ('Ryan', 'McDonald')]
+
+
+def test_backfill_sets_keys(db_engine):
+    _load(db_engine, BIOS, STATS)
+    with Session(db_engine) as session:
+        keys = set(session.exec(select(Stats.name_key)))
+    assert keys == {name_key(f, l) for f, l in STATS}
+
+
+def test_resolve_aliases_threshold_and_blocking(db_engine):
+    _load(db_engine, BIOS, STATS)
+    with Session(db_engine) as session:
+        # leblanc matches exactly; smith scores ~0.87; deangelo ~0.80;
+        # mcdonald/macdonald score ~0.96 but sit in different prefix blocks
+        assert resolve_aliases(session) == 1
+        aliases = {a.alias_key: a.name_key for a in session.exec(select(NameAlias))}
+        assert aliases == {'smith|matt': 'smith|matthew'}
+
+        assert resolve_aliases(session, threshold=0.75) == 1
+        aliases = {a.alias_key: a.name_key for a in session.exec(select(NameAlias))}
+        assert aliases['deangelo|nick'] == 'deangelo|nicholas'
+        assert 'mcdonald|ryan' not in aliases
+
+        # resolved keys are not revisited, and mcdonald has no candidate in its block
+        assert resolve_aliases(session, threshold=0.0) == 0
+
+
+def test_join_bio_stats_goes_through_aliases(db_engine):
+    _load(db_engine, BIOS, STATS)
+    statement = join_bio_stats(Stats.first_name, Stats.last_name, Bio.first_name, Bio.last_name)
+    with Session(db_engine) as session:
+        assert sorted(session.exec(statement).all()) == [('Jacob', 'Leblanc', 'Jacob', 'LeBlanc')]
+        resolve_aliases(session)
+        rows = sorted(session.exec(statement).all())
+    assert rows == [
+        ('Jacob', 'Leblanc', 'Jacob', 'LeBlanc'),
+        ('Matt', 'Smith', 'Matthew', 'Smith'),
+    ]
@@ -0,0 +1,54 @@
+import csv
+
+import pytest
+
+from scripts.normalize_stats_players import normalize_file, normalize_name_part, normalize_player_field
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('McDonald', 'McDonald'),
+    ("O'Brien", "O'Brien"),
+    ('LeBlanc', 'LeBlanc'),
+    ('Van der Berg', 'Van der Berg'),
+    ('mcdonald', 'Mcdonald'),
+    ("o'brien", "O'Brien"),
+    ('SMITH-JONES', 'Smith-Jones'),
+    (' "de-luca" ', 'De-Luca'),
+    ('Bartecko  Bartecko', 'Bartecko'),
+])
+def test_normalize_name_part(raw, expected):
+    assert normalize_name_part(raw) == expected
+
+
+def test_normalize_player_field():
+    assert normalize_player_field('bartecko, dominik bartecko, dominik') == 'Bartecko, Dominik'
+
+
+def _write(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        csv.writer(fh).writerows(rows)
+
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8') as fh:
+        return list(csv.reader(fh))
+
+
+def test_split_name_layout_keeps_cased_names(tmp_path):
+    path = tmp_path / 'stats.csv'
+    _write(path, [
+        ['jersey_number', 'first_name', 'last_name', 'G'],
+        ['1', 'Ryan', 'McDonald', '3'],
+        ['2', 'jacob', 'LEBLANC', '4'],
+    ])
+    result = normalize_file(str(path))
+    assert result['error'] is None and result['rows'] == 2
+    assert _read(path)[1:] == [['1', 'Ryan', 'McDonald', '3'], ['2', 'Jacob', 'Leblanc', '4']]
+
+
+def test_missing_explicit_column_leaves_file(tmp_path):
+    path = tmp_path / 'stats.csv'
+    rows = [['first_name', 'last_name'], ['ryan', 'mcdonald']]
+    _write(path, rows)
+    assert 'Player' in normalize_file(str(path), column='Player')['error']
+    assert _read(path) == rows
@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from scripts import pipeline
+from scripts.pipeline import Stage, is_up_to_date, table_fingerprint
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / 'hockey.db'
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE stats (first_name TEXT, last_name TEXT, PTS INTEGER)')
+    conn.executemany('INSERT INTO stats VALUES (?, ?, ?)', [('A', 'B', 1), ('C', 'D', 2)])
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(pipeline, 'DB_PATH', str(path))
+    return path
+
+
+def test_table_fingerprint_tracks_content(db_path):
+    before = table_fingerprint('stats')
+    assert before.startswith('2:')
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE stats SET PTS = 3 WHERE first_name = 'A'")
+    conn.commit()
+    conn.close()
+    assert table_fingerprint('stats') != before
+    assert table_fingerprint('missing') is None
+
+
+def test_load_stage_reruns_when_database_is_gone(db_path):
+    stage = Stage('load', ['true'], tables=['stats'])
+    record = {'status': 'ok', 'inputs': {}, 'outputs': {}, 'tables': pipeline.table_fingerprints(['stats'])}
+    assert is_up_to_date(stage, record)
+    db_path.unlink()
+    assert not is_up_to_date(stage, record)
+
+
+def test_record_without_tables_is_stale(db_path):
+    stage = Stage('load', ['true'], tables=['stats'])
+    assert not is_up_to_date(stage, {'status': 'ok', 'inputs': {}, 'outputs': {}})
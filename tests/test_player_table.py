@@ -0,0 +1,45 @@
+from sqlalchemy import func, literal_column
+from sqlmodel import Session, select
+
+import query
+from models import Bio
+from player_table import FLOAT, INT, STR, PlayerTable
+
+
+def _load_bios(db_engine):
+    with Session(db_engine) as session:
+        for i, (position, weight) in enumerate([('Forward', 180), ('Forward', 175), ('Defense', 195), ('Goaltender', None)]):
+            session.add(Bio(first_name=f'F{i}', last_name=f'L{i}', position=position, weight=weight))
+        session.commit()
+
+
+def test_from_query_aggregate(db_engine):
+    _load_bios(db_engine)
+    table = PlayerTable.from_query(query.build_query('position_weight'), db_engine=db_engine)
+    assert table.schema['avg_weight'] == FLOAT
+    assert table.schema['players'] == INT
+    assert [r.as_dict() for r in table] == [
+        {'position': 'Defense', 'avg_weight': 195.0, 'players': 1},
+        {'position': 'Forward', 'avg_weight': 177.5, 'players': 2},
+        {'position': 'Goaltender', 'avg_weight': None, 'players': 1},
+    ]
+
+
+def test_from_query_untyped_expressions(db_engine):
+    _load_bios(db_engine)
+    statement = select(
+        Bio.first_name,
+        func.avg(Bio.weight).label('untyped_avg'),
+        literal_column('7').label('seven'),
+        literal_column("'x'").label('tag'),
+    ).group_by(Bio.first_name).order_by(Bio.first_name)
+    table = PlayerTable.from_query(statement, db_engine=db_engine)
+    assert table.schema == {'first_name': STR, 'untyped_avg': FLOAT, 'seven': INT, 'tag': STR}
+    assert table[0].as_dict() == {'first_name': 'F0', 'untyped_avg': 180.0, 'seven': 7, 'tag': 'x'}
+    assert table[3].untyped_avg is None
+
+
+def test_str_column_accepts_non_strings():
+    table = PlayerTable({'value': STR})
+    table.extend([{'value': 1.5}, {'value': 'a'}, {'value': None}])
+    assert table.column('value') == [1.5, 'a', None]